@@ -0,0 +1,152 @@
+"""
+Bytes-on-wire and CPU cost of response compression.
+
+Offline mode encodes synthetic pages of the list endpoints (user cards,
+sellers, search) at several page sizes and reports, for each gzip level
+and brotli quality, the compressed size, ratio and compression time per
+response. With --base-url it also fetches real endpoints of a running
+instance with `identity`, `gzip` and `br` and reports the bytes received.
+
+Usage:
+    python -m bench.compression_bench --sizes 10 50 100
+    python -m bench.compression_bench --base-url http://127.0.0.1:8000 \\
+        --path "/hotwheels/search/?query=mustang&page_size=100" \\
+        --path /user_hotwheels/hotwheels/<uuid>/sellers?limit=100
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+import zlib
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import httpx
+
+from bench.serialization_bench import fast_path, make_rows
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVELS = [1, 6, 9]
+BROTLI_QUALITIES = [1, 4, 11]
+
+
+def seller_page(size, rng):
+    items = [{
+        "user_id": str(uuid4()),
+        "nickname": f"collector{rng.randrange(100000)}",
+        "avatar_url": None if i % 3 else f"https://example.com/avatars/{i}.png",
+        "price": str(Decimal(rng.randrange(100, 50000)) / 100),
+        "is_negotiable": i % 2 == 0,
+        "description": "Blister intacto, cartela com pequenas marcas" if i % 2 else None,
+        "state": rng.choice(["SP", "RJ", "MG", "PR", "RS"]),
+        "city": rng.choice(["São Paulo", "Rio de Janeiro", "Curitiba", "Belo Horizonte"]),
+        "cep": f"{rng.randrange(10000, 99999)}-{rng.randrange(100, 999)}",
+        "quantity": 1 + i % 3,
+        "sold": False,
+    } for i in range(size)]
+    return json.dumps({"total": size, "items": items, "next_cursor": None, "total_mode": "exact"}).encode()
+
+
+def search_page(size, rng):
+    base = datetime(2024, 1, 1)
+    items = [{
+        "id": str(uuid4()),
+        "model_name": rng.choice(["'67 Camaro", "Twin Mill", "Bone Shaker", "Ford Mustang Mach-E", "Deora II"]),
+        "image_url": f"https://example.com/images/{i}.jpg",
+        "collector_number": str(rng.randrange(1, 250)),
+        "series": rng.choice(["HW Dream Garage", "Muscle Mania", "HW Exotics", "Factory Fresh"]),
+        "color": rng.choice(["Red", "Blue", "Black", "Spectraflame Purple"]),
+        "release_year": rng.randrange(1968, 2025),
+        "created_at": (base + timedelta(minutes=i)).isoformat(),
+        "update_at": (base + timedelta(minutes=i)).isoformat(),
+    } for i in range(size)]
+    meta = {"total_items": 5000, "total_pages": 50, "current_page": 1, "page_size": size,
+            "has_next": True, "has_prev": False, "next_cursor": "x" * 60, "total_mode": "cached"}
+    return json.dumps({"items": items, "meta": meta}).encode()
+
+
+def payloads(sizes, rng):
+    for size in sizes:
+        yield "cards", size, fast_path(make_rows(size, rng))
+        yield "sellers", size, seller_page(size, rng)
+        yield "search", size, search_page(size, rng)
+
+
+def time_compression(compress, body, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compressed = compress(body)
+        timings.append((time.perf_counter() - start) * 1000)
+    return len(compressed), round(statistics.median(timings), 4)
+
+
+def gzip_compress(level):
+    return lambda body: (lambda c: c.compress(body) + c.flush())(zlib.compressobj(level, zlib.DEFLATED, 31))
+
+
+def offline(args):
+    rng = random.Random(args.seed)
+    results = []
+    for endpoint, size, body in payloads(args.sizes, rng):
+        entry = {"endpoint": endpoint, "page_size": size, "raw_bytes": len(body), "encodings": {}}
+        codecs = [(f"gzip-{level}", gzip_compress(level)) for level in GZIP_LEVELS]
+        if brotli is not None:
+            codecs += [(f"br-{quality}", lambda b, q=quality: brotli.compress(b, quality=q)) for quality in BROTLI_QUALITIES]
+        for name, compress in codecs:
+            size_bytes, ms = time_compression(compress, body, args.repeat)
+            entry["encodings"][name] = {
+                "bytes": size_bytes,
+                "ratio": round(len(body) / size_bytes, 2),
+                "ms": ms,
+            }
+        results.append(entry)
+    return results
+
+
+def live(args):
+    results = []
+    with httpx.Client(base_url=args.base_url, timeout=30) as client:
+        for path in args.path:
+            entry = {"path": path, "encodings": {}}
+            for encoding in ["identity", "gzip", "br"]:
+                timings = []
+                wire = None
+                for _ in range(args.live_repeat):
+                    start = time.perf_counter()
+                    with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+                        # Raw bytes as received, before httpx decodes them
+                        wire = sum(len(chunk) for chunk in response.iter_raw())
+                        served = response.headers.get("content-encoding", "identity")
+                    timings.append((time.perf_counter() - start) * 1000)
+                entry["encodings"][encoding] = {
+                    "served_as": served,
+                    "wire_bytes": wire,
+                    "p50_ms": round(statistics.median(timings), 3),
+                }
+            results.append(entry)
+    return results
+
+
+def main(args):
+    report = {"brotli_available": brotli is not None, "offline": offline(args)}
+    if args.base_url:
+        report["live"] = live(args)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--base-url", help="running API to measure live responses")
+    parser.add_argument("--path", action="append", default=[], help="endpoint path (repeatable)")
+    parser.add_argument("--live-repeat", type=int, default=20)
+    main(parser.parse_args())
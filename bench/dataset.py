@@ -0,0 +1,242 @@
+"""
+Synthetic dataset for the benchmark suite (bench/suite.py).
+
+Loads the catalog (the real export through src/hotwheels/importer.py
+when --catalog is given, topped up with synthetic models up to
+--catalog-size), then N users with their ownership rows (SALE/COLLECTION
+mix, a share of the sales already sold) and wishlists. Model popularity
+follows a Zipf law with exponent --skew over a seeded random ranking, so
+a few models have many owners and sellers while the long tail has
+almost none; collection sizes are exponential around their mean. The
+same arguments and seed always produce the same rows.
+
+Bench rows are marked (users @bench.example.com, synthetic models by their
+notes) so --reset removes them without touching other data. Every bench
+user has the password BENCH_PASSWORD.
+
+Usage (with the docker-compose Postgres up):
+    python -m bench.dataset --users 5000 --owned 40 --wishlist 10 --skew 1.1
+    python -m bench.dataset --catalog other/hotwheels.csv --users 20000
+    python -m bench.dataset --reset
+"""
+import argparse
+import bisect
+import csv
+import io
+import itertools
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from src.auth.utils import hash_password
+from src.database import create_database, engine
+from src.user_hotwheels.market import rebuild_market
+
+BENCH_EMAIL_DOMAIN = "bench.example.com"
+BENCH_PASSWORD = "bench-password"
+SYNTHETIC_NOTE = "synthetic model (bench.dataset)"
+
+MAKES = ["Ford", "Chevy", "Dodge", "Nissan", "Toyota", "Honda", "Porsche", "Lamborghini", "Ferrari",
+         "Mazda", "Volkswagen", "BMW", "Mercedes-Benz", "Plymouth", "Pontiac", "Datsun", "Audi", "Tesla"]
+MODELS = ["Mustang", "Camaro", "Charger", "Skyline GT-R", "Supra", "Civic Type R", "911 Carrera",
+          "Countach", "F40", "RX-7", "Beetle", "M3", "300 SL", "Barracuda", "GTO", "510 Wagon",
+          "Quattro", "Model S", "Corvette", "Bel Air", "Bronco", "Impala", "Silvia", "Aventador"]
+FANTASY = ["Twin Mill", "Bone Shaker", "Deora II", "Rodger Dodger", "Sharkruiser", "Fast Fish",
+           "Rip Rod", "Night Shifter", "Boneshaker", "Dune It Up", "Loop Coupe", "Tooned Twin Mill"]
+SERIES = ["HW Dream Garage", "Muscle Mania", "HW Exotics", "Factory Fresh", "HW J-Imports", "Mainline",
+          "HW Speed Graphics", "Retro Racers", "HW Flames", "Nightburnerz", "Then and Now", "HW Screen Time"]
+COLORS = ["Red", "Blue", "Black", "White", "Silver", "Yellow", "Green", "Orange", "Purple",
+          "Spectraflame Purple", "Metalflake Gold", "Satin Gray"]
+STATES = {"SP": ["São Paulo", "Campinas", "Santos"], "RJ": ["Rio de Janeiro", "Niterói"],
+          "MG": ["Belo Horizonte", "Uberlândia"], "PR": ["Curitiba", "Londrina"], "RS": ["Porto Alegre"]}
+
+
+def copy_rows(cursor, table, columns, rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def random_uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def synthetic_models(count, start, rng):
+    base = datetime(2024, 1, 1)
+    for i in range(start, start + count):
+        name = rng.choice(FANTASY) if rng.random() < 0.25 else f"{rng.choice(MAKES)} {rng.choice(MODELS)}"
+        if rng.random() < 0.3:
+            name = f"'{rng.randrange(60, 100)} {name}"
+        year = rng.randrange(1968, 2025)
+        yield [
+            random_uuid(rng), name, f"https://{BENCH_EMAIL_DOMAIN}/images/{i}.jpg", str(rng.randrange(1, 250)),
+            rng.choice(SERIES), rng.choice(COLORS), year,
+            year if rng.random() < 0.02 else None, year if rng.random() < 0.005 else None,
+            f"bench{i:027d}", SYNTHETIC_NOTE, 0, base, base,
+        ]
+
+
+def load_catalog(connection, args, rng):
+    """Imports the real catalog when given, then tops it up with synthetic models."""
+    if args.catalog:
+        from src.hotwheels.importer import import_catalog
+        print(json.dumps({"catalog_import": import_catalog(args.catalog, verbose=False)}))
+    cursor = connection.cursor()
+    cursor.execute("SELECT count(*) FROM hotwheels")
+    existing = cursor.fetchone()[0]
+    missing = max(0, args.catalog_size - existing)
+    if missing:
+        copy_rows(cursor, "hotwheels", [
+            "id", "model_name", "image_url", "collector_number", "series", "color", "release_year",
+            "treasure_hunt_year", "super_treasure_hunt_year", "catalog_key", "notes", "visit_count",
+            "created_at", "update_at",
+        ], synthetic_models(missing, existing, rng))
+    connection.commit()
+    cursor.execute("SELECT id FROM hotwheels ORDER BY id")
+    return [row[0] for row in cursor.fetchall()]
+
+
+class Popularity:
+    """Zipf(skew) sampler over a seeded random ranking of the catalog."""
+
+    def __init__(self, ids, skew, rng):
+        self.ids = list(ids)
+        rng.shuffle(self.ids)
+        self.cumulative = list(itertools.accumulate(1 / rank ** skew for rank in range(1, len(self.ids) + 1)))
+
+    def sample(self, count, rng, exclude=()):
+        picked = []
+        seen = set(exclude)
+        for _ in range(count * 10):
+            if len(picked) == count:
+                break
+            hotwheels_id = self.ids[bisect.bisect(self.cumulative, rng.random() * self.cumulative[-1])]
+            if hotwheels_id not in seen:
+                seen.add(hotwheels_id)
+                picked.append(hotwheels_id)
+        return picked
+
+
+def collection_size(mean, limit, rng):
+    return min(limit, max(1, round(rng.expovariate(1 / mean))))
+
+
+def load_users(connection, args, popularity, rng):
+    password = hash_password(BENCH_PASSWORD)
+    base = datetime(2024, 1, 1)
+    cursor = connection.cursor()
+    totals = {"users": 0, "user_hotwheels": 0, "for_sale": 0, "wishlist": 0}
+    for start in range(0, args.users, args.chunk_size):
+        users, owned, wishlist = [], [], []
+        for i in range(start, min(args.users, start + args.chunk_size)):
+            user_id = random_uuid(rng)
+            state = rng.choice(list(STATES))
+            users.append([
+                user_id, f"bench_user_{i}", f"bench{i}@{BENCH_EMAIL_DOMAIN}", password, "USER",
+                rng.random() > 0.05, 0, state, rng.choice(STATES[state]), f"{rng.randrange(10000, 99999)}-000",
+                base, base, base + timedelta(minutes=i),
+            ])
+            models = popularity.sample(collection_size(args.owned, len(popularity.ids), rng), rng)
+            for hotwheels_id in models:
+                sale = rng.random() < args.sale_ratio
+                owned.append([
+                    user_id, hotwheels_id, "SALE" if sale else "COLLECTION", rng.random() < 0.1,
+                    Decimal(f"{rng.lognormvariate(3.5, 0.8):.2f}") if sale else Decimal("0.00"),
+                    sale and rng.random() < 0.1, 1 + int(rng.random() < 0.2), 0, sale and rng.random() < 0.5,
+                    base, base,
+                ])
+                totals["for_sale"] += sale
+            wanted = popularity.sample(collection_size(args.wishlist, len(popularity.ids), rng), rng, exclude=models)
+            wishlist += [[user_id, hotwheels_id, base, base] for hotwheels_id in wanted]
+
+        copy_rows(cursor, "users", [
+            "id", "nickname", "email", "password", "role", "is_active", "visit_count", "state", "city", "cep",
+            "created_at", "updated_at", "last_seen",
+        ], users)
+        copy_rows(cursor, "user_hotwheels", [
+            "user_id", "hotwheels_id", "modality", "favorite", "price", "sold", "quantity", "visit_count",
+            "is_negotiable", "created_at", "update_at",
+        ], owned)
+        copy_rows(cursor, "wishlist", ["user_id", "hotwheels_id", "created_at", "update_at"], wishlist)
+        connection.commit()
+        totals["users"] += len(users)
+        totals["user_hotwheels"] += len(owned)
+        totals["wishlist"] += len(wishlist)
+    return totals
+
+
+def reset(sql_connection):
+    """
+    Removes the bench users, everything they own, and the synthetic models
+    nobody else references. The market table is emptied; callers rebuild it.
+    """
+    sql_connection.execute(text("DELETE FROM hotwheels_market"))
+    bench_users = f"SELECT id FROM users WHERE email LIKE '%@{BENCH_EMAIL_DOMAIN}'"
+    sql_connection.execute(text(
+        f"DELETE FROM collection_item WHERE collection_id IN (SELECT id FROM collection WHERE user_id IN ({bench_users}))"
+    ))
+    for table in ("collection", "wishlist", "user_hotwheels"):
+        sql_connection.execute(text(f"DELETE FROM {table} WHERE user_id IN ({bench_users})"))
+    sql_connection.execute(text(f"DELETE FROM users WHERE email LIKE '%@{BENCH_EMAIL_DOMAIN}'"))
+    sql_connection.execute(text("""
+        DELETE FROM hotwheels h WHERE h.notes = :note
+          AND NOT EXISTS (SELECT 1 FROM user_hotwheels uh WHERE uh.hotwheels_id = h.id)
+          AND NOT EXISTS (SELECT 1 FROM wishlist w WHERE w.hotwheels_id = h.id)
+          AND NOT EXISTS (SELECT 1 FROM collection_item ci WHERE ci.hotwheel_id = h.id)
+    """), {"note": SYNTHETIC_NOTE})
+
+
+def main(args):
+    started = time.perf_counter()
+    create_database()
+    with engine.begin() as sql_connection:
+        reset(sql_connection)
+        if args.reset:
+            rebuild_market(sql_connection)
+            print(json.dumps({"reset": True}))
+            return
+
+    rng = random.Random(args.seed)
+    connection = engine.raw_connection()
+    try:
+        catalog = load_catalog(connection, args, rng)
+        popularity = Popularity(catalog, args.skew, rng)
+        totals = load_users(connection, args, popularity, rng)
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+    with engine.begin() as sql_connection:
+        rebuild_market(sql_connection)
+        sql_connection.execute(text("ANALYZE"))
+
+    print(json.dumps({
+        "seed": args.seed,
+        "skew": args.skew,
+        "catalog": len(catalog),
+        **totals,
+        "seconds": round(time.perf_counter() - started, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--catalog", help="catalog export to import first (CSV or JSONL)")
+    parser.add_argument("--catalog-size", type=int, default=20_000, help="synthetic models are added up to this size")
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--owned", type=float, default=40, help="mean models per user")
+    parser.add_argument("--wishlist", type=float, default=10, help="mean wishlist size")
+    parser.add_argument("--sale-ratio", type=float, default=0.2, help="share of owned models listed for sale")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of model popularity (0 = uniform)")
+    parser.add_argument("--chunk-size", type=int, default=1_000, help="users per COPY batch")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="only remove the bench rows")
+    main(parser.parse_args())
@@ -0,0 +1,200 @@
+"""
+EXPLAIN ANALYZE benchmark for the secondary indexes of user_hotwheels,
+wishlist and collection_item.
+
+Seeds a scratch schema (`index_bench`) with copies of those tables, 1M
+ownership rows by default, then times the query shapes used by the
+routers with only the primary keys ("before") and again after creating
+the indexes declared on the models ("after"). Timings are the median
+`Execution Time` of EXPLAIN (ANALYZE, BUFFERS) over sampled ids; the
+plan of the first sample is kept for each query.
+
+Usage (after `python -m src.database`, so the enum type exists):
+    python -m bench.index_bench --rows 1000000 --samples 50
+"""
+import argparse
+import json
+import random
+import statistics
+
+from sqlalchemy import MetaData, text
+from sqlalchemy.schema import CreateTable
+
+from src.base import Base
+from src.database import engine
+
+SCHEMA = "index_bench"
+TABLES = ["user_hotwheels", "wishlist", "collection_item"]
+
+# Same shapes as the routers and src/user_hotwheels/market.py
+QUERIES = {
+    "hotwheels_users": (
+        "hotwheels",
+        "SELECT * FROM user_hotwheels WHERE hotwheels_id = :id ORDER BY user_id LIMIT 11",
+    ),
+    "hotwheels_sellers": (
+        "hotwheels",
+        "SELECT uh.user_id, uh.price, uh.is_negotiable, uh.quantity, uh.sold, u.is_active "
+        "FROM user_hotwheels uh JOIN users u ON uh.user_id = u.id "
+        "WHERE uh.hotwheels_id = :id AND uh.modality = 'SALE' AND u.is_active "
+        "ORDER BY uh.user_id LIMIT 11",
+    ),
+    "market_aggregate": (
+        "hotwheels",
+        "SELECT count(*), min(price), sum(quantity), "
+        "percentile_cont(0.5) WITHIN GROUP (ORDER BY price) "
+        "FROM user_hotwheels WHERE hotwheels_id = :id AND modality = 'SALE' AND sold = false",
+    ),
+    "wishlist_by_hotwheels": (
+        "hotwheels",
+        "SELECT user_id FROM wishlist WHERE hotwheels_id = :id",
+    ),
+    "collection_items": (
+        "collection",
+        "SELECT * FROM collection_item WHERE collection_id = :id ORDER BY position LIMIT 50",
+    ),
+    "collections_with_hotwheels": (
+        "hotwheels",
+        "SELECT collection_id FROM collection_item WHERE hotwheel_id = :id",
+    ),
+}
+
+
+def bench_tables():
+    metadata = MetaData()
+    return {name: Base.metadata.tables[name].to_metadata(metadata, schema=SCHEMA) for name in TABLES}
+
+
+def create_schema(connection, tables):
+    connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    connection.execute(text(f"CREATE TABLE {SCHEMA}.users (id uuid PRIMARY KEY, is_active boolean NOT NULL)"))
+    for table in tables.values():
+        # Primary keys only; foreign keys would point at the real tables
+        connection.execute(CreateTable(table, include_foreign_key_constraints=[]))
+
+
+def seed(connection, rows, users, hotwheels, collections):
+    params = {"rows": rows, "users": users, "hotwheels": hotwheels, "collections": collections}
+    connection.execute(text(
+        "INSERT INTO users SELECT md5('u' || i)::uuid, i % 20 <> 0 FROM generate_series(0, :users - 1) i"
+    ), params)
+    # (i % users, i / users) is unique, and 7919 is coprime with the
+    # catalog size, so every user owns distinct models.
+    connection.execute(text("""
+        INSERT INTO user_hotwheels (user_id, hotwheels_id, modality, favorite, price, sold, quantity,
+                                    visit_count, is_negotiable, created_at, update_at)
+        SELECT md5('u' || (i % :users))::uuid,
+               md5('h' || (((i / :users) * 7919 + i % :users) % :hotwheels))::uuid,
+               (CASE WHEN i % 5 = 0 THEN 'SALE' ELSE 'COLLECTION' END)::userhotwheelsmodality,
+               i % 7 = 0, round((random() * 500)::numeric, 2), i % 50 = 0, 1 + i % 3,
+               0, i % 2 = 0, now(), now()
+        FROM generate_series(0, :rows - 1) i
+    """), params)
+    connection.execute(text("""
+        INSERT INTO wishlist (user_id, hotwheels_id, created_at, update_at)
+        SELECT md5('u' || (i % :users))::uuid,
+               md5('h' || (((i / :users) * 7919 + i % :users + 1) % :hotwheels))::uuid, now(), now()
+        FROM generate_series(0, :rows / 5 - 1) i
+    """), params)
+    connection.execute(text("""
+        INSERT INTO collection_item (id, collection_id, hotwheel_id, position, created_at, update_at)
+        SELECT gen_random_uuid(), md5('c' || (i % :collections))::uuid,
+               md5('h' || ((i * 7919) % :hotwheels))::uuid, i / :collections, now(), now()
+        FROM generate_series(0, :rows / 3 - 1) i
+    """), params)
+    connection.execute(text("ANALYZE"))
+
+
+def sample_ids(kind, samples, hotwheels, collections, rng):
+    prefix, size = ("h", hotwheels) if kind == "hotwheels" else ("c", collections)
+    return [f"{prefix}{rng.randrange(size)}" for _ in range(samples)]
+
+
+def explain(connection, sql, key):
+    statement = text(
+        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql.replace(':id', 'md5(:key)::uuid')}"
+    )
+    return connection.execute(statement, {"key": key}).scalar()[0]
+
+
+def plan_summary(node):
+    summary = node["Node Type"]
+    if "Index Name" in node:
+        summary += f" using {node['Index Name']}"
+    children = [plan_summary(child) for child in node.get("Plans", [])]
+    return f"{summary} ({', '.join(children)})" if children else summary
+
+
+def run_queries(connection, samples):
+    results = {}
+    for name, (kind, sql) in QUERIES.items():
+        timings = []
+        first = None
+        for key in samples[kind]:
+            plan = explain(connection, sql, key)
+            timings.append(plan["Execution Time"])
+            first = first or plan
+        results[name] = {
+            "median_ms": round(statistics.median(timings), 3),
+            "max_ms": round(max(timings), 3),
+            "shared_hit_blocks": first["Plan"].get("Shared Hit Blocks"),
+            "shared_read_blocks": first["Plan"].get("Shared Read Blocks"),
+            "plan": plan_summary(first["Plan"]),
+        }
+    return results
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    samples = {
+        kind: sample_ids(kind, args.samples, args.hotwheels, args.collections, rng)
+        for kind in ("hotwheels", "collection")
+    }
+    tables = bench_tables()
+    with engine.connect() as connection:
+        with connection.begin():
+            create_schema(connection, tables)
+            # Session-wide, so the queries below hit the scratch copies
+            connection.execute(text(f"SET search_path TO {SCHEMA}, public"))
+        with connection.begin():
+            seed(connection, args.rows, args.users, args.hotwheels, args.collections)
+
+        with connection.begin():
+            before = run_queries(connection, samples)
+        with connection.begin():
+            for table in tables.values():
+                for index in table.indexes:
+                    index.create(bind=connection)
+            connection.execute(text("ANALYZE"))
+        with connection.begin():
+            after = run_queries(connection, samples)
+
+        if not args.keep:
+            with connection.begin():
+                connection.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+    print(json.dumps({
+        "rows": args.rows,
+        "users": args.users,
+        "hotwheels": args.hotwheels,
+        "samples": args.samples,
+        "before": before,
+        "after": after,
+        "speedup": {
+            name: round(before[name]["median_ms"] / after[name]["median_ms"], 1) if after[name]["median_ms"] else None
+            for name in QUERIES
+        },
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="user_hotwheels rows to seed")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--hotwheels", type=int, default=20_000)
+    parser.add_argument("--collections", type=int, default=20_000)
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="keep the index_bench schema afterwards")
+    main(parser.parse_args())
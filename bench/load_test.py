@@ -0,0 +1,91 @@
+"""
+Load benchmark for the read endpoints.
+
+Fires GET requests against a running instance of the API at increasing
+concurrency levels and reports requests/sec and latency percentiles, so the
+numbers can be compared before and after a change (e.g. run once on the
+baseline commit and once on the current one).
+
+Usage:
+    uvicorn src.main:app --workers 1 &
+    python -m bench.load_test --base-url http://127.0.0.1:8000 --hotwheels-id <uuid>
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_level(client, paths, concurrency, total_requests):
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for i in range(total_requests):
+        queue.put_nowait(paths[i % len(paths)])
+
+    async def worker():
+        nonlocal errors
+        while True:
+            try:
+                path = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code >= 500:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "errors": errors,
+        "rps": round(total_requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+async def main(args):
+    paths = [f"/hotwheels/search/?query={q}" for q in ("mustang", "camaro", "skyline", "bone shaker")]
+    if args.hotwheels_id:
+        paths += [
+            f"/hotwheels/{args.hotwheels_id}",
+            f"/user_hotwheels/hotwheels/{args.hotwheels_id}/sellers",
+        ]
+
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        results = []
+        for concurrency in args.concurrency:
+            result = await run_level(client, paths, concurrency, args.requests)
+            results.append(result)
+            print(json.dumps(result))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--hotwheels-id", default=None)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 100, 250, 500])
+    asyncio.run(main(parser.parse_args()))
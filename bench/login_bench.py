@@ -0,0 +1,81 @@
+"""
+Login throughput benchmark for the bcrypt pool.
+
+Runs a storm of concurrent password verifications through
+PasswordHasherPool for several worker counts, reporting verifications/sec,
+rejected (503) requests and the worst event-loop stall observed meanwhile.
+The stall column is what other requests on the same worker would feel.
+
+Usage:
+    python -m bench.login_bench --workers 1 2 4 8 --logins 200 --rounds 12
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import HTTPException
+
+from src import config
+from src.auth.utils import PasswordHasherPool, hash_password, verify_password
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def run(workers: int, max_queue: int, logins: int, hashed: str, inline: bool):
+    pool = PasswordHasherPool(workers, max_queue)
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    rejected = 0
+
+    async def login():
+        nonlocal rejected
+        if inline:
+            verify_password("senha-de-teste", hashed)
+            await asyncio.sleep(0)
+            return
+        try:
+            await pool.run(verify_password, "senha-de-teste", hashed)
+        except HTTPException:
+            rejected += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    worst_lag = await lag_task
+    pool.shutdown()
+
+    return {
+        "mode": "inline" if inline else "pool",
+        "workers": workers,
+        "logins": logins,
+        "accepted": logins - rejected,
+        "rejected": rejected,
+        "logins_per_sec": round((logins - rejected) / elapsed, 1),
+        "max_loop_stall_ms": round(worst_lag * 1000, 1),
+    }
+
+
+async def main(args):
+    config.BCRYPT_ROUNDS = args.rounds
+    hashed = hash_password("senha-de-teste")
+    print(json.dumps(await run(1, 0, args.logins, hashed, inline=True)))
+    for workers in args.workers:
+        print(json.dumps(await run(workers, args.max_queue, args.logins, hashed, inline=False)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--max-queue", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=config.BCRYPT_ROUNDS)
+    asyncio.run(main(parser.parse_args()))
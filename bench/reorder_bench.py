@@ -0,0 +1,227 @@
+"""
+Reorder cost of a large collection: dense integer positions against the
+sparse keys used by src/collections/ordering.py.
+
+Seeds a scratch schema (`reorder_bench`) with a copy of collection_item
+holding one collection of 10k items, then replays the same random
+drag-and-drop moves with both schemes:
+
+- dense: positions 0..n-1; a move shifts every row between the old and
+  the new slot by one, then writes the moved row.
+- sparse: positions gap, 2 * gap, ...; a move reads its two neighbours
+  and writes only the moved row, renumbering inline when no key fits.
+  Lists left crowded are renumbered between moves, untimed, as the
+  background rebalancer would.
+
+The "hotspot" scenario keeps dropping items into the same slot, which
+is the worst case for the sparse keys: the gap halves on every move
+until the list has to be renumbered. A full rebalance of the list is
+timed on its own.
+
+Usage (after `python -m src.database`):
+    python -m bench.reorder_bench --items 10000 --moves 500
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from sqlalchemy import MetaData, text
+from sqlalchemy.schema import CreateTable
+
+from src.base import Base
+from src.collections.ordering import is_crowded, position_between
+from src.database import engine
+from src import config
+
+SCHEMA = "reorder_bench"
+COLLECTION = "00000000-0000-0000-0000-000000000001"
+
+REBALANCE = """
+    UPDATE collection_item SET position = r.rank * :gap
+    FROM (SELECT id, row_number() OVER (ORDER BY position NULLS LAST, id) AS rank
+          FROM collection_item WHERE collection_id = :collection) r
+    WHERE collection_item.id = r.id AND collection_item.position IS DISTINCT FROM r.rank * :gap
+"""
+
+
+def create_schema(connection):
+    table = Base.metadata.tables["collection_item"].to_metadata(MetaData(), schema=SCHEMA)
+    connection.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    connection.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    connection.execute(CreateTable(table, include_foreign_key_constraints=[]))
+    for index in table.indexes:
+        index.create(bind=connection)
+
+
+def seed(connection, items, step):
+    connection.execute(text("TRUNCATE collection_item"))
+    connection.execute(text("""
+        INSERT INTO collection_item (id, collection_id, hotwheel_id, position, created_at, update_at)
+        SELECT md5('i' || i)::uuid, CAST(:collection AS uuid), md5('h' || i)::uuid, i * :step, now(), now()
+        FROM generate_series(0, :items - 1) i
+    """), {"collection": COLLECTION, "items": items, "step": step})
+    connection.execute(text("ANALYZE collection_item"))
+
+
+def ordered_ids(connection):
+    return connection.execute(text(
+        "SELECT id FROM collection_item WHERE collection_id = :collection ORDER BY position, id"
+    ), {"collection": COLLECTION}).scalars().all()
+
+
+def random_moves(items, moves, rng):
+    """(source index, target index) pairs over the list order."""
+    return [(rng.randrange(items), rng.randrange(items)) for _ in range(moves)]
+
+
+def hotspot_moves(items, moves):
+    """Always moves the last item to just after the first one."""
+    return [(items - 1, 1) for _ in range(moves)]
+
+
+def dense_move(connection, source, target):
+    if source == target:
+        return 0
+    if source < target:
+        shift = "position - 1 WHERE position > :source AND position <= :target"
+    else:
+        shift = "position + 1 WHERE position >= :target AND position < :source"
+    moved = connection.execute(text(
+        "SELECT id FROM collection_item WHERE collection_id = :collection AND position = :source"
+    ), {"collection": COLLECTION, "source": source}).scalar()
+    shifted = connection.execute(text(
+        f"UPDATE collection_item SET position = {shift} AND collection_id = :collection"
+    ), {"collection": COLLECTION, "source": source, "target": target}).rowcount
+    connection.execute(text("UPDATE collection_item SET position = :target WHERE id = :id"),
+                       {"target": target, "id": moved})
+    return shifted + 1
+
+
+def sparse_move(connection, order, source, target, stats):
+    """Moves order[source] right after order[target - 1], like POST .../items/{id}/move."""
+    row_id = order.pop(source)
+    after_id = order[target - 1] if target > 0 else None
+    order.insert(target, row_id)
+    params = {"collection": COLLECTION, "row": row_id, "after": after_id}
+    neighbours = """
+        SELECT b.position,
+               (SELECT min(position) FROM collection_item
+                WHERE collection_id = :collection AND id <> :row
+                  AND (b.position IS NULL OR position > b.position))
+        FROM (SELECT (SELECT position FROM collection_item WHERE id = :after) AS position) b
+    """
+    before, after = connection.execute(text(neighbours), params).one()
+    position = position_between(before, after, config.COLLECTION_POSITION_GAP)
+    written = 1
+    if position is None:
+        written += connection.execute(
+            text(REBALANCE), {"collection": COLLECTION, "gap": config.COLLECTION_POSITION_GAP}
+        ).rowcount
+        stats["inline_rebalances"] += 1
+        before, after = connection.execute(text(neighbours), params).one()
+        position = position_between(before, after, config.COLLECTION_POSITION_GAP)
+    elif is_crowded(before, position, after, config.COLLECTION_REBALANCE_MIN_GAP):
+        stats["rebalances_scheduled"] += 1
+        stats["pending"] = True
+    connection.execute(text("UPDATE collection_item SET position = :position WHERE id = :row"),
+                       {"position": position, "row": row_id})
+    return written
+
+
+def summarize(timings, written):
+    timings = sorted(timings)
+    return {
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "max_ms": round(timings[-1], 3),
+        "rows_written_per_move": round(statistics.mean(written), 1),
+        "rows_written_max": max(written),
+    }
+
+
+def run_dense(connection, items, moves):
+    with connection.begin():
+        seed(connection, items, 1)
+    timings, written = [], []
+    for source, target in moves:
+        with connection.begin():
+            start = time.perf_counter()
+            written.append(dense_move(connection, source, target))
+            timings.append((time.perf_counter() - start) * 1000)
+    return summarize(timings, written)
+
+
+def run_sparse(connection, items, moves):
+    with connection.begin():
+        seed(connection, items, config.COLLECTION_POSITION_GAP)
+        order = ordered_ids(connection)
+    stats = {"inline_rebalances": 0, "rebalances_scheduled": 0, "background_rows_rewritten": 0}
+    timings, written = [], []
+    for source, target in moves:
+        with connection.begin():
+            start = time.perf_counter()
+            written.append(sparse_move(connection, order, source, target, stats))
+            timings.append((time.perf_counter() - start) * 1000)
+        if stats.pop("pending", False):
+            # What the background rebalancer does, outside the timed moves
+            with connection.begin():
+                stats["background_rows_rewritten"] += connection.execute(
+                    text(REBALANCE), {"collection": COLLECTION, "gap": config.COLLECTION_POSITION_GAP}
+                ).rowcount
+    with connection.begin():
+        final = ordered_ids(connection)
+    if final != order:
+        raise SystemExit("Sparse keys lost the expected order")
+    return {**summarize(timings, written), **stats}
+
+
+def time_rebalance(connection, items, repeat):
+    timings = []
+    for _ in range(repeat):
+        with connection.begin():
+            # Odd steps, so every row really gets a new key
+            seed(connection, items, config.COLLECTION_POSITION_GAP // 2 + 1)
+        with connection.begin():
+            start = time.perf_counter()
+            connection.execute(text(REBALANCE), {"collection": COLLECTION, "gap": config.COLLECTION_POSITION_GAP})
+            timings.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(timings), 3), "rows": items}
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    scenarios = {
+        "random": random_moves(args.items, args.moves, rng),
+        "hotspot": hotspot_moves(args.items, args.moves),
+    }
+    report = {"items": args.items, "moves": args.moves, "gap": config.COLLECTION_POSITION_GAP}
+    with engine.connect() as connection:
+        with connection.begin():
+            create_schema(connection)
+            # Session-wide, so the statements below hit the scratch copy
+            connection.execute(text(f"SET search_path TO {SCHEMA}, public"))
+        for name, moves in scenarios.items():
+            report[name] = {
+                "dense": run_dense(connection, args.items, moves),
+                "sparse": run_sparse(connection, args.items, moves),
+            }
+        report["full_rebalance"] = time_rebalance(connection, args.items, args.rebalance_repeat)
+
+        if not args.keep:
+            with connection.begin():
+                connection.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--moves", type=int, default=500)
+    parser.add_argument("--rebalance-repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="keep the reorder_bench schema afterwards")
+    main(parser.parse_args())
@@ -0,0 +1,89 @@
+"""
+Latency benchmark for the catalog name search.
+
+Compares the old filter (`similarity(model_name, q) > t`, which forces a
+sequential scan) against the indexed `model_name % q` filter used by
+`search_hotwheels`, for queries sampled from the catalog CSV with a typo
+injected. Each query runs the count and the first page, like the endpoint.
+
+Usage (after `python -m src.database` has loaded the catalog):
+    python -m bench.search_bench --csv other/hotwheels.csv --samples 200
+"""
+import argparse
+import csv
+import json
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+
+from src.database import engine
+
+OLD_COUNT = "SELECT count(*) FROM hotwheels WHERE similarity(model_name, :q) > :t"
+OLD_PAGE = (
+    "SELECT id FROM hotwheels WHERE similarity(model_name, :q) > :t "
+    "ORDER BY similarity(model_name, :q) DESC LIMIT 20"
+)
+NEW_COUNT = "SELECT count(*) FROM hotwheels WHERE model_name % :q"
+NEW_PAGE = (
+    "SELECT id FROM hotwheels WHERE model_name % :q "
+    "ORDER BY similarity(model_name, :q) DESC, id LIMIT 20"
+)
+
+
+def sample_queries(csv_path, samples, seed):
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        names = [row["model_name"] for row in csv.DictReader(f) if row.get("model_name")]
+    rng = random.Random(seed)
+    queries = []
+    for name in rng.sample(names, min(samples, len(names))):
+        if len(name) > 4:
+            # Drop one character to simulate a typo.
+            i = rng.randrange(len(name))
+            name = name[:i] + name[i + 1:]
+        queries.append(name)
+    return queries
+
+
+def time_queries(connection, queries, count_sql, page_sql, threshold):
+    timings = []
+    for q in queries:
+        params = {"q": q, "t": threshold}
+        start = time.perf_counter()
+        connection.execute(text(count_sql), params).scalar()
+        connection.execute(text(page_sql), params).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+    }
+
+
+def main(args):
+    queries = sample_queries(args.csv, args.samples, args.seed)
+    with engine.connect() as connection:
+        connection.execute(
+            text("SELECT set_config('pg_trgm.similarity_threshold', :t, false)"),
+            {"t": str(args.threshold)},
+        )
+        results = {
+            "queries": len(queries),
+            "threshold": args.threshold,
+            "similarity_function": time_queries(connection, queries, OLD_COUNT, OLD_PAGE, args.threshold),
+            "trigram_operator": time_queries(connection, queries, NEW_COUNT, NEW_PAGE, args.threshold),
+        }
+        plan = connection.execute(text("EXPLAIN " + NEW_COUNT), {"q": queries[0]}).scalars().all()
+        results["trigram_operator_plan"] = plan
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--csv", default="other/hotwheels.csv")
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
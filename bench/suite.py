@@ -0,0 +1,290 @@
+"""
+Scenario benchmark suite for the API, on the bench.dataset rows.
+
+Drives the FastAPI app through scripted user sessions and reports, per
+scenario, throughput, latency percentiles and the SQL statements and
+database time per request, as JSON tagged with the git commit, so a run
+can be saved and compared with a run on another commit.
+
+Scenarios (targets are drawn with --seed, weighted by popularity):
+- search_typing: suggest on every keystroke of a model name, then the
+  search page and the chosen model.
+- profile_views: a profile, its cards and wishlist, and the membership
+  badges of those cards for another user.
+- seller_lists: market summary and the first two pages of sellers of a
+  model.
+- login_burst: every session is a login, fired all at once.
+
+By default the app runs in process (httpx ASGITransport, with its
+lifespan) with rate limiting and load shedding disabled, since the suite
+is a single client. With --base-url it targets a running server instead,
+which should be started with RATE_LIMIT_ENABLED=false. SQL counts come
+from the /metrics deltas around each scenario in both modes (against a
+server, pass its INTERNAL_TOKEN with --internal-token or the env var).
+
+Usage (after `python -m bench.dataset`):
+    python -m bench.suite --sessions 200 --concurrency 16 --output before.json
+    python -m bench.suite --output after.json --compare before.json
+    python -m bench.suite --base-url http://127.0.0.1:8000 --scenarios seller_lists
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import secrets
+import statistics
+import subprocess
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import httpx
+
+from bench.load_test import percentile
+
+SCENARIOS = ["search_typing", "profile_views", "seller_lists", "login_burst"]
+METRIC_LINE = re.compile(r'^(http_request_db_queries|http_request_db_duration_seconds)_(sum|count)\{[^}]*\} (\S+)$')
+
+
+def load_targets(rng, sample):
+    """Users and models to visit, weighted by how many rows reference them."""
+    from sqlalchemy import text
+    from bench.dataset import BENCH_EMAIL_DOMAIN
+    from src.database import engine
+
+    with engine.connect() as connection:
+        users = connection.execute(text(f"""
+            SELECT u.id, u.email, count(uh.hotwheels_id) AS weight
+            FROM users u LEFT JOIN user_hotwheels uh ON uh.user_id = u.id
+            WHERE u.email LIKE '%@{BENCH_EMAIL_DOMAIN}' AND u.is_active
+            GROUP BY u.id, u.email ORDER BY u.id
+        """)).all()
+        models = connection.execute(text("""
+            SELECT h.id, h.model_name, count(uh.user_id) AS weight
+            FROM hotwheels h JOIN user_hotwheels uh ON uh.hotwheels_id = h.id
+            WHERE h.model_name IS NOT NULL
+            GROUP BY h.id, h.model_name ORDER BY h.id
+        """)).all()
+    if not users or not models:
+        raise SystemExit("No bench data; run `python -m bench.dataset` first")
+    return {
+        "users": rng.choices(users, weights=[user.weight + 1 for user in users], k=sample),
+        "models": rng.choices(models, weights=[model.weight for model in models], k=sample),
+    }
+
+
+def search_typing(targets, i, rng):
+    model = targets["models"][i]
+    name = model.model_name.strip()
+    typed = name[:rng.randrange(3, max(4, min(len(name), 12)) + 1)]
+    steps = [("GET", "/hotwheels/suggest", {"q": typed[:length], "limit": 8}, None) for length in range(1, len(typed) + 1)]
+    if len(typed) >= 2:
+        steps.append(("GET", "/hotwheels/search/", {"query": typed, "page_size": 20}, None))
+    steps.append(("GET", f"/hotwheels/{model.id}", None, None))
+    return steps
+
+
+def profile_views(targets, i, rng):
+    user = targets["users"][i]
+    viewer = targets["users"][(i + 1) % len(targets["users"])]
+    return [
+        ("GET", f"/users/{user.id}", None, None),
+        ("GET", f"/user_hotwheels/user/{user.id}/cards", {"limit": 20}, None),
+        ("GET", f"/wishlist/user/{user.id}", None, None),
+        # The ids come from the cards page, see run_session
+        ("POST", f"/users/{viewer.id}/membership", None, "cards"),
+    ]
+
+
+def seller_lists(targets, i, rng):
+    model = targets["models"][i]
+    return [
+        ("GET", f"/hotwheels/{model.id}/market", None, None),
+        ("GET", f"/user_hotwheels/hotwheels/{model.id}/sellers", {"limit": 20}, None),
+        ("GET", f"/user_hotwheels/hotwheels/{model.id}/sellers", {"limit": 20}, "next_cursor"),
+    ]
+
+
+def login_burst(targets, i, rng):
+    from bench.dataset import BENCH_PASSWORD
+
+    return [("POST", "/auth/login", None, {"email": targets["users"][i].email, "password": BENCH_PASSWORD})]
+
+
+async def run_session(client, steps, latencies, statuses):
+    """Runs one session's requests in order; later steps may use data from earlier responses."""
+    page = {}
+    for method, path, params, extra in steps:
+        body = extra if isinstance(extra, dict) else None
+        if extra == "cards":
+            body = {"hotwheels_ids": [item["id"] for item in page.get("items", [])]}
+            if not body["hotwheels_ids"]:
+                continue
+        elif extra == "next_cursor":
+            if not page.get("next_cursor"):
+                continue
+            params = {**params, "cursor": page["next_cursor"]}
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, params=params, json=body)
+        except httpx.HTTPError:
+            response = None
+            statuses["error"] += 1
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response is not None:
+            statuses[response.status_code] += 1
+            # The list pages feed the membership lookup and the next sellers page
+            if response.status_code == 200 and path.endswith(("/cards", "/sellers")):
+                page = response.json()
+
+
+def parse_sql_totals(metrics_text):
+    """Sums the per-request SQL histograms over all routes: (queries, db seconds, requests)."""
+    totals = Counter()
+    for line in metrics_text.splitlines():
+        match = METRIC_LINE.match(line)
+        if match:
+            totals[f"{match.group(1)}_{match.group(2)}"] += float(match.group(3))
+    return totals["http_request_db_queries_sum"], totals["http_request_db_duration_seconds_sum"], totals["http_request_db_queries_count"]
+
+
+async def scrape_sql(client, token):
+    response = await client.get("/metrics", headers={"Authorization": f"Bearer {token}"} if token else None)
+    return parse_sql_totals(response.text) if response.status_code == 200 else None
+
+
+async def run_scenario(client, name, targets, args, rng):
+    build = globals()[name]
+    sessions = [build(targets, i, rng) for i in range(args.sessions)]
+    concurrency = args.sessions if name == "login_burst" else args.concurrency
+    latencies, statuses = [], Counter()
+    queue = asyncio.Queue()
+    for steps in sessions:
+        queue.put_nowait(steps)
+
+    async def worker():
+        while not queue.empty():
+            await run_session(client, queue.get_nowait(), latencies, statuses)
+
+    before = await scrape_sql(client, args.internal_token)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(sessions)))))
+    elapsed = time.perf_counter() - started
+    after = await scrape_sql(client, args.internal_token)
+
+    result = {
+        "sessions": len(sessions),
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": sum(count for status, count in statuses.items() if status == "error" or status >= 500),
+        "status_codes": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies), 2) if latencies else None,
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(max(latencies), 2) if latencies else None,
+        },
+    }
+    if before is not None and after is not None:
+        # The /metrics scrape itself is one request without SQL
+        queries, db_seconds, requests = (a - b for a, b in zip(after, before))
+        requests = max(1, requests - 1)
+        result["sql"] = {
+            "queries": int(queries),
+            "queries_per_request": round(queries / requests, 2),
+            "db_ms_per_request": round(db_seconds * 1000 / requests, 3),
+        }
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    """Ratios against a previous report (> 1 means higher than the baseline)."""
+    changes = {}
+    for name, result in report["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        pairs = {
+            "throughput_rps": (result["throughput_rps"], old["throughput_rps"]),
+            "p95_ms": (result["latency_ms"]["p95"], old["latency_ms"]["p95"]),
+            "p99_ms": (result["latency_ms"]["p99"], old["latency_ms"]["p99"]),
+        }
+        if "sql" in result and "sql" in old:
+            pairs["queries_per_request"] = (result["sql"]["queries_per_request"], old["sql"]["queries_per_request"])
+        changes[name] = {key: round(new / old_value, 2) if old_value else None for key, (new, old_value) in pairs.items()}
+    return {"baseline_commit": baseline.get("meta", {}).get("commit"), "ratios": changes}
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    targets = load_targets(rng, args.sessions)
+    limits = httpx.Limits(max_connections=max(args.concurrency, args.sessions))
+
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+            return {name: await run_scenario(client, name, targets, args, rng) for name in args.scenarios}
+
+    from src.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            return {name: await run_scenario(client, name, targets, args, rng) for name in args.scenarios}
+
+
+def main(args):
+    if not args.base_url:
+        # A single client would only measure the limiter; must be set before src.config loads
+        os.environ["RATE_LIMIT_ENABLED"] = "false"
+        os.environ["LOAD_SHED_MAX_IN_FLIGHT"] = "0"
+        os.environ["METRICS_ENABLED"] = "true"
+        args.internal_token = args.internal_token or secrets.token_urlsafe(16)
+        os.environ["INTERNAL_TOKEN"] = args.internal_token
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "mode": args.base_url or "in-process",
+            "seed": args.seed,
+            "sessions": args.sessions,
+            "concurrency": args.concurrency,
+        },
+        "scenarios": asyncio.run(run(args)),
+    }
+    if args.compare:
+        with open(args.compare) as baseline:
+            report["comparison"] = compare(report, json.load(baseline))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", help="running API to target instead of the in-process app")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--sessions", type=int, default=200, help="sessions per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent sessions (login_burst fires all)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--internal-token", default=os.getenv("INTERNAL_TOKEN"), help="token for /metrics")
+    parser.add_argument("--output", help="also write the report to this file")
+    parser.add_argument("--compare", help="previous report to compute ratios against")
+    main(parser.parse_args())
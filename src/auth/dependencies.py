@@ -1,19 +1,35 @@
 from fastapi import Request, Depends, HTTPException, Response
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Annotated, Any
-from src.auth.utils import decode_jwt
+from src.auth.utils import decode_jwt, decode_jwt_cached
 from fastapi import Depends
-from sqlalchemy.orm import Session
-from src.database import get_session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database import get_async_session
+from src.auth.models import User, UserRole
+from src.auth.schemas import Principal
 from src.auth.service import AuthenticationService, SQLAlchemyAuthService
+from src.ttl_cache import TTLCache
+from src import config
+from uuid import UUID
+import hmac
+import jwt
+
+security = HTTPBearer()
+
+# sub -> is_active; evita consultar o usuário a cada requisição autenticada.
+# O TTL é a janela de revogação: um usuário desativado continua autorizado
+# por até AUTH_USER_STATUS_TTL segundos nos workers que já o têm em cache
+# (o PATCH /users/{id} descarta a entrada no próprio worker). Não há
+# revogação por token (jti): para derrubar os tokens de alguém, desative-o.
+user_status_cache = TTLCache(config.AUTH_USER_STATUS_TTL, config.AUTH_TOKEN_CACHE_SIZE)
 
 def get_token_info(request: Request, response: Response):
     token = request.cookies.get("token")
     if token == None:
         return token
     try:
-        payload = decode_jwt(token)
-        print(payload)
-        return payload
+        return decode_jwt(token)
     except Exception as e:
         response.delete_cookie("token")
         return None
@@ -22,6 +38,64 @@ def get_token_info(request: Request, response: Response):
 UserDependecie = Annotated[Any, Depends(get_token_info)]
 
 def get_auth_service(
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ) -> AuthenticationService:
-    return SQLAlchemyAuthService(session)
\ No newline at end of file
+    return SQLAlchemyAuthService(session)
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: AsyncSession = Depends(get_async_session)
+) -> Principal:
+    """
+    Monta o usuário autenticado só com as claims do token. O banco só é
+    consultado para checar se o usuário continua ativo, e essa resposta
+    fica em cache por AUTH_USER_STATUS_TTL segundos (ver user_status_cache).
+    """
+    try:
+        payload = decode_jwt_cached(credentials.credentials)
+        user_id = UUID(payload["sub"])
+    except (jwt.PyJWTError, KeyError, ValueError):
+        raise HTTPException(
+            status_code=401, detail="Invalid authentication credentials"
+        )
+
+    is_active = user_status_cache.get(user_id)
+    if is_active is None:
+        is_active = bool(await session.scalar(select(User.is_active).where(User.id == user_id)))
+        user_status_cache.set(user_id, is_active)
+    if not is_active:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    try:
+        return Principal(
+            id=user_id,
+            email=payload.get("email"),
+            nickname=payload.get("nickname"),
+            role=payload.get("role"),
+            jti=payload.get("jti"),
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=401, detail="Invalid authentication credentials"
+        )
+
+
+PrincipalDependency = Annotated[Principal, Depends(get_current_principal)]
+
+
+async def require_internal_access(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Protege /internal/* e /metrics: aceita o INTERNAL_TOKEN (coletores como
+    o Prometheus) ou o token de um usuário admin.
+    """
+    if config.INTERNAL_TOKEN and hmac.compare_digest(
+        credentials.credentials.encode(), config.INTERNAL_TOKEN.encode()
+    ):
+        return
+    principal = await get_current_principal(credentials, session)
+    if principal.role != UserRole.ADMIN.value:
+        raise HTTPException(status_code=403, detail="Admin access required")
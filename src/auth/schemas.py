@@ -20,4 +20,13 @@ class UserPublic(BaseModel):
 
 class TokenResponse(BaseModel):
     user: UserPublic
-    token: str
\ No newline at end of file
+    token: str
+
+
+class Principal(BaseModel):
+    """Usuário autenticado, montado apenas a partir das claims do JWT."""
+    id: UUID4
+    email: EmailStr
+    nickname: str | None = None
+    role: str
+    jti: str | None = None
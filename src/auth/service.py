@@ -1,11 +1,17 @@
 from typing import Protocol
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
 from src.auth.models import User
 from src.auth.schemas import UserLogin, UserRegister, UserPublic, TokenResponse
-from src.auth.utils import hash_password, verify_password, generate_payload, encode_jwt
+from src.auth.utils import (
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash,
+    generate_payload,
+    encode_jwt,
+)
 
 
 class AuthenticationService(Protocol):
@@ -16,53 +22,57 @@ class AuthenticationService(Protocol):
     Login -- login de usuário
     """
 
-    def register(self, user: UserRegister) -> tuple[User, str]: ...
+    async def register(self, user: UserRegister) -> tuple[User, str]: ...
 
-    def login(self, user: UserLogin) -> tuple[User, str]: ...
+    async def login(self, user: UserLogin) -> tuple[User, str]: ...
 
 
 class SQLAlchemyAuthService:
     """Implementação dos serviços de autenticação."""
 
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         """Inicializa o serviço com uma sessão do banco de dados."""
         self.session = session
 
-    def register(self, user: UserRegister) -> tuple[User, str]:
+    async def register(self, user: UserRegister) -> tuple[User, str]:
         """Registra um novo usuário no banco de dados."""
-        result = self.session.execute(
+        result = (await self.session.execute(
             select(User).where(User.email == user.email)
-        ).first()
+        )).first()
         if result:
             """Verifica se o e-mail já está cadastrado."""
             raise HTTPException(status_code=409, detail="E-mail já cadastrado.")
 
-        result2 = self.session.execute(
+        result2 = (await self.session.execute(
             select(User).where(User.nickname == user.nickname)
-        ).first()
+        )).first()
         if result2:
             """Verifica se o apelido já está cadastrado."""
             raise HTTPException(status_code=409, detail="Apelido já cadastrado.")
 
-        user.password = hash_password(user.password)
+        user.password = await hash_password_async(user.password)
         user_db = User(**user.model_dump())
 
         self.session.add(user_db)
-        self.session.commit()
-        self.session.refresh(user_db)
+        await self.session.commit()
+        await self.session.refresh(user_db)
 
         payload = generate_payload(user_db)
         token = encode_jwt(payload)
 
         return user_db, token
 
-    def login(self, user: UserLogin) -> tuple[User, str]:
+    async def login(self, user: UserLogin) -> tuple[User, str]:
         """Realiza o login de um usuário no sistema"""
         statement = select(User).where(User.email == user.email)
-        user_db = self.session.execute(statement).scalars().first()
+        user_db = (await self.session.execute(statement)).scalars().first()
 
-        if user_db and verify_password(user.password, user_db.password):
+        if user_db and await verify_password_async(user.password, user_db.password):
             """Verifica se o usuário existe e se a senha está correta."""
+            if password_needs_rehash(user_db.password):
+                """Refaz o hash quando o custo do bcrypt foi alterado."""
+                user_db.password = await hash_password_async(user.password)
+                await self.session.commit()
             payload = generate_payload(user_db)
             token = encode_jwt(payload)
             return user_db, token
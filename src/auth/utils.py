@@ -1,9 +1,15 @@
 import bcrypt
 from dotenv import load_dotenv
+import asyncio
 import os
+import time
 import jwt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
 from uuid import uuid4
+from src import config
+from src.ttl_cache import TTLCache
 
 load_dotenv()
 
@@ -23,7 +29,7 @@ def hash_password(password: str) -> str:
     """
     return bcrypt.hashpw(
         bytes(password, encoding="utf-8"),
-        bcrypt.gensalt(),
+        bcrypt.gensalt(rounds=config.BCRYPT_ROUNDS),
     ).decode("utf-8")
 
 
@@ -44,6 +50,85 @@ def verify_password(password: str, hashed_password: str) -> bool:
     )
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Verifica se o hash foi gerado com um custo diferente do configurado.
+    
+    Args:
+        hashed_password (str): Senha armazenada no banco ("$2b$<custo>$...").
+        
+    Returns:
+        bool: True se o hash deve ser refeito com BCRYPT_ROUNDS.
+    """
+    try:
+        return int(hashed_password.split("$")[2]) != config.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+class PasswordHasherPool:
+    """
+    Executa o bcrypt em threads dedicadas, fora do event loop.
+    
+    No máximo `workers` hashes rodam ao mesmo tempo e até `max_queue`
+    aguardam na fila; além disso a requisição falha rápido com 503.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.rejected = 0
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+
+    async def run(self, func, *args):
+        if self.in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Servidor ocupado, tente novamente em instantes.",
+                headers={"Retry-After": "1"},
+            )
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            self.in_flight -= 1
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+
+password_pool = PasswordHasherPool(config.PASSWORD_HASH_WORKERS, config.PASSWORD_HASH_MAX_QUEUE)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Versão assíncrona de `hash_password`, executada no pool do bcrypt.
+    
+    Args:
+        password (str): Senha a passar pelo hasher.
+        
+    Returns:
+        str: Senha hasheada.
+    """
+    return await password_pool.run(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    """
+    Versão assíncrona de `verify_password`, executada no pool do bcrypt.
+    
+    Args:
+        password (str): Senha a ser verificada.
+        hashed_password (str): Senha armazenada no banco.
+        
+    Returns:
+        bool: True se a senha for igual, False caso contrário.
+    """
+    return await password_pool.run(verify_password, password, hashed_password)
+
+
 def encode_jwt(payload):
     """
     Codifica o JWT com variáveis de ambiente.
@@ -67,6 +152,29 @@ def decode_jwt(token):
     return jwt.decode(token, JWT_SECRET, JWT_ALGORITHM)
 
 
+decoded_tokens = TTLCache(0, config.AUTH_TOKEN_CACHE_SIZE)
+
+
+def decode_jwt_cached(token):
+    """
+    Decodifica o JWT, memorizando o payload pelo token bruto até o `exp`.
+    Chamadas repetidas com o mesmo token pulam a verificação da assinatura.
+    
+    Args:
+        token (str): token a ser decodificado.
+        
+    Returns:
+        dict: Payload verificado.
+    """
+    payload = decoded_tokens.get(token)
+    if payload is None:
+        payload = decode_jwt(token)
+        ttl = payload.get("exp", 0) - time.time()
+        if ttl > 0:
+            decoded_tokens.set(token, payload, ttl)
+    return payload
+
+
 def generate_payload(user_db):
     """
     Gera o payload para o JWT.
@@ -81,6 +189,7 @@ def generate_payload(user_db):
         "sub": str(user_db.id),
         "role": str(user_db.role.value),
         "email": user_db.email,
+        "nickname": user_db.nickname,
         "iat": datetime.now(timezone.utc).timestamp(),
         "exp": (datetime.now(timezone.utc) + timedelta(hours=1)).timestamp(),
         "jti": str(uuid4()),
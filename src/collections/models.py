@@ -1,5 +1,5 @@
 from sqlalchemy.orm import declarative_base, relationship
-from sqlalchemy import Column, Integer, String, UUID, TIMESTAMP, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, UUID, TIMESTAMP, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from uuid import uuid4
 from src.base import Base
@@ -32,4 +32,17 @@ class CollectionItem(Base):
     update_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
     
     collection = relationship("Collection", back_populates="items")
-    hotwheels = relationship("Hotwheels", back_populates="collections_items")
\ No newline at end of file
+    hotwheels = relationship("Hotwheels", back_populates="collections_items")
+
+    __table_args__ = (
+        # Itens de uma coleção, já na ordem de exibição
+        Index('idx_collection_item_collection_position', collection_id, position),
+        # Ordem da listagem paginada: itens sem posição (anteriores à
+        # ordenação) vão para o fim; 2147483647 é o POSITION_MAX de ordering.py
+        Index(
+            'idx_collection_item_display_order',
+            collection_id, func.coalesce(position, 2147483647), id,
+        ),
+        # Em quais coleções um modelo aparece
+        Index('idx_collection_item_hotwheel', hotwheel_id, collection_id),
+    )
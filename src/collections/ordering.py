@@ -0,0 +1,226 @@
+from dataclasses import dataclass
+from sqlalchemy import func, select, update
+from src.collections.models import Collection, CollectionItem
+from src import config
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Range of the Integer position columns
+POSITION_MIN = -(2 ** 31)
+POSITION_MAX = 2 ** 31 - 1
+
+
+@dataclass(frozen=True)
+class Ordering:
+    """
+    A sparse ordering key: `key` orders the rows of `model` that share the
+    same `parent` value. With `unique`, the key is covered by a unique
+    constraint, so renumbering goes through temporary values first.
+    """
+    name: str
+    model: type
+    key: object
+    parent: object
+    unique: bool = False
+
+
+ITEM_ORDER = Ordering("collection-items", CollectionItem, CollectionItem.position, CollectionItem.collection_id)
+COLLECTION_ORDER = Ordering(
+    "user-collections", Collection, Collection.display_order, Collection.user_id, unique=True
+)
+ORDERINGS = {ordering.name: ordering for ordering in (ITEM_ORDER, COLLECTION_ORDER)}
+
+
+def position_between(before: int | None, after: int | None, gap: int) -> int | None:
+    """
+    A key strictly between two neighbour keys, where None is the edge of
+    the list. Returns None when no integer fits (the gap ran out).
+    """
+    if before is None and after is None:
+        position = gap
+    elif before is None:
+        position = after - gap
+    elif after is None:
+        position = before + gap
+    elif after - before < 2:
+        return None
+    else:
+        position = before + (after - before) // 2
+    return position if POSITION_MIN <= position <= POSITION_MAX else None
+
+
+def is_crowded(before: int | None, position: int, after: int | None, min_gap: int) -> bool:
+    """Tells whether a key left less than `min_gap` to one of its neighbours."""
+    return (before is not None and position - before < min_gap) or (
+        after is not None and after - position < min_gap
+    )
+
+
+async def lock(session, ordering: Ordering, parent_id):
+    """
+    Serializes reorders and rebalances of one list until the transaction
+    ends; otherwise a move could pick a key from positions that a
+    concurrent rebalance is rewriting.
+    """
+    await session.execute(
+        select(func.pg_advisory_xact_lock(func.hashtextextended(f"{ordering.name}:{parent_id}", 0)))
+    )
+
+
+async def rebalance(session, ordering: Ordering, parent_id, gap: int | None = None):
+    """
+    Renumbers a list to gap, 2 * gap, ... keeping the current order (rows
+    without a key go last). update_at is kept: the rows did not change.
+    """
+    gap = gap or config.COLLECTION_POSITION_GAP
+    model, key = ordering.model, ordering.key
+    await lock(session, ordering, parent_id)
+    rank = func.row_number().over(order_by=(key.asc().nulls_last(), model.id))
+    ranked = select(model.id.label("id"), rank.label("rank")).where(ordering.parent == parent_id).subquery()
+
+    if ordering.unique:
+        # The constraint is checked row by row, so the rows first move below
+        # every current key, where neither the old nor the new keys can clash
+        lowest = await session.scalar(select(func.min(key)).where(ordering.parent == parent_id))
+        floor = min(lowest or 0, 0)
+        await session.execute(
+            update(model)
+            .values({key: floor - ranked.c.rank, model.update_at: model.update_at})
+            .where(model.id == ranked.c.id)
+            .execution_options(synchronize_session=False)
+        )
+
+    result = await session.execute(
+        update(model)
+        .values({key: ranked.c.rank * gap, model.update_at: model.update_at})
+        .where(model.id == ranked.c.id, key.is_distinct_from(ranked.c.rank * gap))
+        # Callers assign the moved row's key afterwards; other loaded rows may go stale
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def _neighbours(session, ordering: Ordering, parent_id, row_id, after_id):
+    """Keys around the slot right after `after_id` (the top when None), ignoring the moved row."""
+    model, key = ordering.model, ordering.key
+    siblings = select(func.min(key)).where(ordering.parent == parent_id)
+    if row_id is not None:
+        siblings = siblings.where(model.id != row_id)
+    if after_id is None:
+        return None, await session.scalar(siblings)
+    before = await session.scalar(select(key).where(model.id == after_id))
+    if before is None:
+        return None, None
+    return before, await session.scalar(siblings.where(key > before))
+
+
+async def place(session, ordering: Ordering, parent_id, row_id, after_id) -> int:
+    """
+    Key for `row_id` right after the sibling `after_id` (None for the top),
+    so moving a row is a single-row write. When the gaps around the slot
+    run low a background rebalance is scheduled; only when they ran out
+    completely is the list renumbered inline, within this transaction.
+    """
+    gap = config.COLLECTION_POSITION_GAP
+    await lock(session, ordering, parent_id)
+    before, after = await _neighbours(session, ordering, parent_id, row_id, after_id)
+    # A sibling without a key (rows from before the ordering) also forces a renumbering
+    position = None if after_id is not None and before is None else position_between(before, after, gap)
+    if position is None:
+        await rebalance(session, ordering, parent_id, gap)
+        rebalancer.inline += 1
+        before, after = await _neighbours(session, ordering, parent_id, row_id, after_id)
+        position = position_between(before, after, gap)
+    elif is_crowded(before, position, after, config.COLLECTION_REBALANCE_MIN_GAP):
+        rebalancer.schedule(ordering, parent_id)
+    return position
+
+
+async def append_position(session, ordering: Ordering, parent_id) -> int:
+    """Key after the last row of a list."""
+    gap = config.COLLECTION_POSITION_GAP
+    await lock(session, ordering, parent_id)
+    last = await session.scalar(select(func.max(ordering.key)).where(ordering.parent == parent_id))
+    position = position_between(last, None, gap)
+    if position is None:
+        await rebalance(session, ordering, parent_id, gap)
+        rebalancer.inline += 1
+        last = await session.scalar(select(func.max(ordering.key)).where(ordering.parent == parent_id))
+        position = position_between(last, None, gap)
+    return position
+
+
+class Rebalancer:
+    """
+    Renumbers crowded lists in the background, each in its own
+    transaction, every `interval` seconds. Lists are queued by `place`
+    when a move leaves a gap below COLLECTION_REBALANCE_MIN_GAP, so moves
+    rarely have to renumber inline.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.pending: set[tuple[str, object]] = set()
+        self.rebalanced = 0
+        self.rows_rewritten = 0
+        self.inline = 0
+        self.failed = 0
+        self.last_ms = None
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+    def schedule(self, ordering: Ordering, parent_id):
+        self.pending.add((ordering.name, parent_id))
+
+    async def run_pending(self, session_maker):
+        pending, self.pending = self.pending, set()
+        for name, parent_id in pending:
+            started = time.perf_counter()
+            try:
+                async with session_maker() as session:
+                    rows = await rebalance(session, ORDERINGS[name], parent_id)
+                    await session.commit()
+            except Exception:
+                # Dropped: the next crowded move schedules it again
+                logger.exception("Rebalance of %s:%s failed", name, parent_id)
+                self.failed += 1
+                continue
+            self.rebalanced += 1
+            self.rows_rewritten += rows
+            self.last_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    async def _run(self, session_maker):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.run_pending(session_maker)
+
+    def start(self, session_maker):
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run(session_maker))
+
+    async def stop(self):
+        """Stops the background task after a last round of pending rebalances."""
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self.pending),
+            "rebalanced": self.rebalanced,
+            "rows_rewritten": self.rows_rewritten,
+            "inline_rebalances": self.inline,
+            "failed": self.failed,
+            "last_ms": self.last_ms,
+        }
+
+
+rebalancer = Rebalancer(config.COLLECTION_REBALANCE_INTERVAL)
@@ -1,7 +1,255 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from typing import List
+from src.collections.models import Collection, CollectionItem
+from src.collections.ordering import COLLECTION_ORDER, ITEM_ORDER, POSITION_MAX, append_position, place, rebalancer
+from src.collections.schemas import (
+    CollectionCreate,
+    CollectionUpdate,
+    CollectionResponse,
+    CollectionMove,
+    CollectionItemCreate,
+    CollectionItemResponse,
+    CollectionItemListResponse,
+)
+from src.hotwheels.cache import catalog_cache
+from src.database import get_async_session
+from src.pagination import fetch_page
+from src.totals import TotalMode, totals_cache
+from uuid import UUID
 
 router = APIRouter()
 
-@router.get("/")
-def placeholder():
-    return {"message": "Collections router"}
\ No newline at end of file
+# Items saved before the ordering have no position; they sort last (by id),
+# as the rebalance numbers them, and the keyset never compares with NULL.
+# A literal, so it matches idx_collection_item_display_order.
+ITEM_DISPLAY_KEY = func.coalesce(CollectionItem.position, literal_column(str(POSITION_MAX)))
+
+
+async def get_collection_or_404(db: AsyncSession, collection_id: UUID) -> Collection:
+    collection = await db.get(Collection, collection_id)
+    if not collection:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Collection not found",
+        )
+    return collection
+
+
+async def get_item_or_404(db: AsyncSession, collection_id: UUID, item_id: UUID) -> CollectionItem:
+    item = await db.get(CollectionItem, item_id)
+    if not item or item.collection_id != collection_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Collection item not found",
+        )
+    return item
+
+
+@router.post("/", response_model=CollectionResponse)
+async def create_collection(collection: CollectionCreate, db: AsyncSession = Depends(get_async_session)):
+    try:
+        db_collection = Collection(
+            **collection.model_dump(),
+            display_order=await append_position(db, COLLECTION_ORDER, collection.user_id),
+        )
+        db.add(db_collection)
+        await db.commit()
+        await db.refresh(db_collection)
+        return db_collection
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid user_id",
+        )
+
+
+@router.get("/user/{user_id}", response_model=List[CollectionResponse])
+async def get_user_collections(user_id: UUID, db: AsyncSession = Depends(get_async_session)):
+    """All collections of a user, in display order."""
+    collections = await db.scalars(
+        select(Collection)
+        .where(Collection.user_id == user_id)
+        .order_by(Collection.display_order, Collection.id)
+    )
+    return collections.all()
+
+
+@router.get("/{collection_id}", response_model=CollectionResponse)
+async def get_collection(collection_id: UUID, db: AsyncSession = Depends(get_async_session)):
+    return await get_collection_or_404(db, collection_id)
+
+
+@router.patch("/{collection_id}", response_model=CollectionResponse)
+async def update_collection(
+    collection_id: UUID,
+    update_data: CollectionUpdate,
+    db: AsyncSession = Depends(get_async_session),
+):
+    collection = await get_collection_or_404(db, collection_id)
+    update_values = {k: v for k, v in update_data.model_dump().items() if v is not None}
+    if not update_values:
+        return collection  # Nothing to update
+
+    for key, value in update_values.items():
+        setattr(collection, key, value)
+    await db.commit()
+    await db.refresh(collection)
+    return collection
+
+
+@router.delete("/{collection_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_collection(collection_id: UUID, db: AsyncSession = Depends(get_async_session)):
+    collection = await get_collection_or_404(db, collection_id)
+    await db.execute(delete(CollectionItem).where(CollectionItem.collection_id == collection_id))
+    await db.delete(collection)
+    await db.commit()
+    totals_cache.invalidate(f"collection-items:{collection_id}")
+    return None
+
+
+@router.post("/{collection_id}/move", response_model=CollectionResponse)
+async def move_collection(
+    collection_id: UUID,
+    move: CollectionMove,
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Moves a collection right after `after_id` among the user's collections
+    (to the top when after_id is null). Only the moved row is written.
+    """
+    collection = await get_collection_or_404(db, collection_id)
+    if move.after_id is not None:
+        anchor = await db.get(Collection, move.after_id)
+        if not anchor or anchor.user_id != collection.user_id or anchor.id == collection.id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="after_id is not another collection of this user",
+            )
+
+    collection.display_order = await place(db, COLLECTION_ORDER, collection.user_id, collection.id, move.after_id)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The collections were reordered concurrently, try again",
+        )
+    await db.refresh(collection)
+    return collection
+
+
+@router.get("/{collection_id}/items", response_model=CollectionItemListResponse)
+async def get_collection_items(
+    collection_id: UUID,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: str | None = None,
+    total_mode: TotalMode = TotalMode.EXACT,
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Items of a collection in display order.
+    Pass the returned next_cursor as cursor to fetch the next page by key.
+    """
+    await get_collection_or_404(db, collection_id)
+    rows, total, total_mode, next_cursor = await fetch_page(
+        db,
+        select(CollectionItem, ITEM_DISPLAY_KEY.label("display_key")).where(
+            CollectionItem.collection_id == collection_id
+        ),
+        [(ITEM_DISPLAY_KEY, False, int), (CollectionItem.id, False, UUID)],
+        lambda row: [row.display_key, row.CollectionItem.id],
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        scope=f"collection-items:{collection_id}",
+        total_mode=total_mode,
+    )
+    items = [row.CollectionItem for row in rows]
+
+    # The rebalance gives the unpositioned items a position
+    if any(item.position is None for item in items):
+        rebalancer.schedule(ITEM_ORDER, collection_id)
+    return {"total": total, "items": items, "next_cursor": next_cursor, "total_mode": total_mode}
+
+
+@router.post("/{collection_id}/items", response_model=CollectionItemResponse)
+async def add_collection_item(
+    collection_id: UUID,
+    item: CollectionItemCreate,
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Adds a Hot Wheels to the end of a collection."""
+    await get_collection_or_404(db, collection_id)
+    if not await catalog_cache.get(db, item.hotwheel_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Hotwheels not found",
+        )
+    existing = await db.scalar(
+        select(CollectionItem.id).where(
+            CollectionItem.collection_id == collection_id,
+            CollectionItem.hotwheel_id == item.hotwheel_id,
+        )
+    )
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="This Hot Wheels is already in the collection",
+        )
+
+    db_item = CollectionItem(
+        collection_id=collection_id,
+        hotwheel_id=item.hotwheel_id,
+        position=await append_position(db, ITEM_ORDER, collection_id),
+    )
+    db.add(db_item)
+    await db.commit()
+    await db.refresh(db_item)
+    totals_cache.invalidate(f"collection-items:{collection_id}")
+    return db_item
+
+
+@router.post("/{collection_id}/items/{item_id}/move", response_model=CollectionItemResponse)
+async def move_collection_item(
+    collection_id: UUID,
+    item_id: UUID,
+    move: CollectionMove,
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Drag-and-drop reorder: moves an item right after `after_id` (to the
+    top when after_id is null). The item gets a key between its new
+    neighbours, so only the moved row is written.
+    """
+    item = await get_item_or_404(db, collection_id, item_id)
+    if move.after_id is not None:
+        anchor = await db.get(CollectionItem, move.after_id)
+        if not anchor or anchor.collection_id != collection_id or anchor.id == item.id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="after_id is not another item of this collection",
+            )
+
+    item.position = await place(db, ITEM_ORDER, collection_id, item.id, move.after_id)
+    await db.commit()
+    await db.refresh(item)
+    return item
+
+
+@router.delete("/{collection_id}/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_collection_item(
+    collection_id: UUID,
+    item_id: UUID,
+    db: AsyncSession = Depends(get_async_session),
+):
+    item = await get_item_or_404(db, collection_id, item_id)
+    await db.delete(item)
+    await db.commit()
+    totals_cache.invalidate(f"collection-items:{collection_id}")
+    return None
@@ -0,0 +1,46 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+from src.pagination import ListResponse
+
+class CollectionCreate(BaseModel):
+    user_id: UUID
+    name: str
+    description: str
+
+class CollectionUpdate(BaseModel):
+    name: str | None = None
+    description: str | None = None
+
+class CollectionResponse(BaseModel):
+    id: UUID
+    user_id: UUID
+    name: str
+    description: str
+    display_order: int
+    created_at: datetime
+    update_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class CollectionMove(BaseModel):
+    # Sibling to place the moved row right after; None moves it to the top
+    after_id: UUID | None = None
+
+class CollectionItemCreate(BaseModel):
+    hotwheel_id: UUID
+
+class CollectionItemResponse(BaseModel):
+    id: UUID
+    collection_id: UUID
+    hotwheel_id: UUID
+    position: int | None = None
+    created_at: datetime
+    update_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class CollectionItemListResponse(ListResponse[CollectionItemResponse]):
+    pass
@@ -0,0 +1,131 @@
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Pool de conexões do engine compartilhado
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)
+# Timeout por statement no Postgres, em milissegundos (0 desativa)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+
+# Paginação por cursor e totais em cache
+CURSOR_SECRET = os.getenv("CURSOR_SECRET") or os.getenv("JWT_SECRET")
+if not CURSOR_SECRET:
+    # Com chave vazia qualquer cliente conseguiria forjar cursores
+    raise RuntimeError("CURSOR_SECRET (or JWT_SECRET) must be set to sign pagination cursors")
+TOTALS_CACHE_TTL = float(os.getenv("TOTALS_CACHE_TTL", "60"))
+TOTALS_CACHE_SIZE = int(os.getenv("TOTALS_CACHE_SIZE", "10000"))
+
+# Cache do catálogo de Hotwheels
+CATALOG_CACHE_SIZE = int(os.getenv("CATALOG_CACHE_SIZE", "4096"))
+CATALOG_PRELOAD = env_bool("CATALOG_PRELOAD", False)
+# Intervalo mínimo (s) entre verificações do carimbo de versão (max(update_at))
+CATALOG_VERSION_CHECK_INTERVAL = float(os.getenv("CATALOG_VERSION_CHECK_INTERVAL", "30"))
+# Máximo de IDs aceitos por POST /hotwheels/batch e POST /users/{id}/membership
+HOTWHEELS_BATCH_MAX = int(os.getenv("HOTWHEELS_BATCH_MAX", "100"))
+# Máximo de carros por requisição em lote de user_hotwheels, e linhas por statement
+USER_HOTWHEELS_BULK_MAX = int(os.getenv("USER_HOTWHEELS_BULK_MAX", "2000"))
+USER_HOTWHEELS_BULK_CHUNK = int(os.getenv("USER_HOTWHEELS_BULK_CHUNK", "1000"))
+# Conjuntos de modelos (tem / à venda / na wishlist) por usuário, em memória
+MEMBERSHIP_CACHE_ENABLED = env_bool("MEMBERSHIP_CACHE_ENABLED", True)
+MEMBERSHIP_CACHE_TTL = float(os.getenv("MEMBERSHIP_CACHE_TTL", "60"))
+MEMBERSHIP_CACHE_SIZE = int(os.getenv("MEMBERSHIP_CACHE_SIZE", "1000"))
+# Contagens de facetas da busca, em cache por filtro
+FACETS_CACHE_TTL = float(os.getenv("FACETS_CACHE_TTL", "300"))
+FACETS_CACHE_SIZE = int(os.getenv("FACETS_CACHE_SIZE", "1000"))
+# Quantas séries (as mais frequentes) a faceta de séries devolve
+FACET_SERIES_LIMIT = int(os.getenv("FACET_SERIES_LIMIT", "50"))
+
+# Autocomplete (/hotwheels/suggest), servido da memória
+# Intervalo (s) entre verificações de mudança no catálogo
+SUGGEST_REFRESH_INTERVAL = float(os.getenv("SUGGEST_REFRESH_INTERVAL", "30"))
+# Reconstrói mesmo sem mudança após este tempo (s), para atualizar os pesos (visit_count)
+SUGGEST_REWEIGHT_INTERVAL = float(os.getenv("SUGGEST_REWEIGHT_INTERVAL", "600"))
+SUGGEST_MAX_LIMIT = int(os.getenv("SUGGEST_MAX_LIMIT", "20"))
+# Prefixos com o top-k já calculado
+SUGGEST_CACHE_SIZE = int(os.getenv("SUGGEST_CACHE_SIZE", "4096"))
+
+# Hash de senhas (bcrypt)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Threads dedicadas ao bcrypt e tamanho máximo da fila de espera (excedida -> 503)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+
+# Autenticação stateless (JWT)
+# Tokens já verificados ficam memorizados até expirarem
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+# Por quanto tempo (s) o status ativo/inativo de um usuário é reaproveitado;
+# é também o prazo máximo para a desativação de um usuário valer em todos os workers
+AUTH_USER_STATUS_TTL = float(os.getenv("AUTH_USER_STATUS_TTL", "30"))
+
+# Respostas de listagens grandes serializadas com orjson, sem revalidar o response_model
+FAST_JSON_RESPONSES = env_bool("FAST_JSON_RESPONSES", False)
+
+# Cache HTTP (ETag / Last-Modified / Cache-Control)
+# max-age e stale-while-revalidate (s) das leituras públicas do catálogo
+HTTP_CACHE_CATALOG_MAX_AGE = int(os.getenv("HTTP_CACHE_CATALOG_MAX_AGE", "300"))
+HTTP_CACHE_CATALOG_STALE = int(os.getenv("HTTP_CACHE_CATALOG_STALE", "60"))
+
+# Compressão das respostas (gzip; brotli se o pacote estiver instalado)
+COMPRESSION_ENABLED = env_bool("COMPRESSION_ENABLED", True)
+# Respostas menores que isto (bytes) saem sem compressão
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_CONTENT_TYPES = [
+    content_type.strip()
+    for content_type in os.getenv(
+        "COMPRESSION_CONTENT_TYPES",
+        "application/json,text/html,text/plain,text/css,application/javascript",
+    ).split(",")
+    if content_type.strip()
+]
+
+# Rate limiting (token bucket por IP ou `sub` do JWT), no formato "<requisições>/<segundos>"
+RATE_LIMIT_ENABLED = env_bool("RATE_LIMIT_ENABLED", True)
+RATE_LIMIT_DEFAULT = os.getenv("RATE_LIMIT_DEFAULT", "300/60")
+RATE_LIMIT_SEARCH = os.getenv("RATE_LIMIT_SEARCH", "60/60")
+RATE_LIMIT_LOGIN = os.getenv("RATE_LIMIT_LOGIN", "10/60")
+RATE_LIMIT_REGISTER = os.getenv("RATE_LIMIT_REGISTER", "5/300")
+# Máximo de buckets em memória (os menos usados são descartados)
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+# Usa o primeiro IP de X-Forwarded-For (apenas atrás de um proxy confiável)
+RATE_LIMIT_TRUST_FORWARDED = env_bool("RATE_LIMIT_TRUST_FORWARDED", False)
+
+# Métricas por rota em /metrics (formato Prometheus)
+METRICS_ENABLED = env_bool("METRICS_ENABLED", True)
+# Cabeçalho Server-Timing com o tempo total e o tempo no banco (para depuração local)
+METRICS_SERVER_TIMING = env_bool("METRICS_SERVER_TIMING", False)
+# Token (Authorization: Bearer) que libera /internal/* e /metrics para coletores;
+# sem ele, só usuários admin têm acesso
+INTERNAL_TOKEN = os.getenv("INTERNAL_TOKEN", "")
+
+# Load shedding: acima deste número de requisições em andamento responde 503 (0 desativa)
+LOAD_SHED_MAX_IN_FLIGHT = int(os.getenv("LOAD_SHED_MAX_IN_FLIGHT", "200"))
+LOAD_SHED_RETRY_AFTER = int(os.getenv("LOAD_SHED_RETRY_AFTER", "1"))
+
+# Contagem de visitas (write-behind)
+VISIT_COUNTER_SHARDS = int(os.getenv("VISIT_COUNTER_SHARDS", "8"))
+# Intervalo (s) entre flushes e linhas por UPDATE ... FROM (VALUES ...)
+VISIT_FLUSH_INTERVAL = float(os.getenv("VISIT_FLUSH_INTERVAL", "10"))
+VISIT_FLUSH_BATCH = int(os.getenv("VISIT_FLUSH_BATCH", "1000"))
+
+# Ordenação das coleções e dos itens: posições esparsas, uma escrita por movimento
+# Distância entre posições vizinhas ao inserir no fim e após um rebalanceamento
+COLLECTION_POSITION_GAP = int(os.getenv("COLLECTION_POSITION_GAP", "1024"))
+# Um movimento que deixa um vão menor que isto agenda o rebalanceamento em segundo plano
+COLLECTION_REBALANCE_MIN_GAP = int(os.getenv("COLLECTION_REBALANCE_MIN_GAP", "4"))
+# Intervalo (s) entre as rodadas de rebalanceamento
+COLLECTION_REBALANCE_INTERVAL = float(os.getenv("COLLECTION_REBALANCE_INTERVAL", "5"))
@@ -1,13 +1,18 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from src.auth.models import User
-from src.hotwheels.models import Hotwheels
+from src.hotwheels.models import Hotwheels, SEARCH_VECTOR_SQL
+from src.hotwheels.catalog_key import ensure_catalog_key
 from src.collections.models import Collection, CollectionItem
 from src.wishlist.models import Wishlist
 from src.user_hotwheels.models import UserHotwheels #, UserHotwheelsSale
+from src.user_hotwheels.market import rebuild_market
 from src.base import Base
+from src.pool_metrics import InstrumentedAsyncQueuePool, instrument_pool
+from src.metrics import instrument_queries
+from src import config
 from dotenv import load_dotenv
-import pandas as pd
 import os
 
 load_dotenv()
@@ -20,12 +25,52 @@ POSTGRES_PORT = os.getenv("POSTGRES_PORT")
 
 
 DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOSTNAME}:{POSTGRES_PORT}/{POSTGRES_DB}"
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOSTNAME}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
-engine = create_engine(DATABASE_URL)
+POOL_OPTIONS = {
+    "pool_size": config.DB_POOL_SIZE,
+    "max_overflow": config.DB_MAX_OVERFLOW,
+    "pool_timeout": config.DB_POOL_TIMEOUT,
+    "pool_recycle": config.DB_POOL_RECYCLE,
+    "pool_pre_ping": config.DB_POOL_PRE_PING,
+}
+
+# Engine síncrono: usado apenas por scripts (criação do schema, carga do catálogo).
+engine = create_engine(DATABASE_URL, **POOL_OPTIONS)
+
+# Engine assíncrono: usado pelos routers, para não bloquear o event loop.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=InstrumentedAsyncQueuePool,
+    connect_args={"server_settings": {"statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS)}},
+    **POOL_OPTIONS,
+)
+instrument_pool(async_engine.sync_engine)
+instrument_queries(async_engine.sync_engine)
+async_session_maker = async_sessionmaker(async_engine, expire_on_commit=False)
 
 
 def create_database():
-    Base.metadata.create_all(bind=engine)
+    # pg_trgm precisa existir antes dos índices GIN com gin_trgm_ops.
+    with engine.begin() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        Base.metadata.create_all(bind=connection)
+        # Bancos criados antes da busca textual não têm a coluna gerada.
+        connection.execute(text(
+            "ALTER TABLE hotwheels ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+        ))
+        # Nem a chave natural; duplicatas da carga antiga são mescladas
+        # antes do índice único.
+        ensure_catalog_key(connection)
+        # Duplicava a PK de user_hotwheels (removido do modelo)
+        connection.execute(text("DROP INDEX IF EXISTS idx_user_hotwheels_membership"))
+        # create_all só cria índices junto com tabelas novas; em bancos já
+        # existentes os índices adicionados depois são criados aqui.
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=connection, checkfirst=True)
+        rebuild_market(connection)
 
 
 def get_session():
@@ -33,12 +78,18 @@ def get_session():
         yield session
 
 
+async def get_async_session():
+    async with async_session_maker() as session:
+        yield session
+
+
 def add_hotwheels():
-    df = pd.read_csv("other/hotwheels.csv")
-    df.to_sql("hotwheels", engine, if_exists="append", index=False)
+    # Importação em streaming e idempotente (ver src/hotwheels/importer.py)
+    from src.hotwheels.importer import import_catalog
+    return import_catalog("other/hotwheels.csv")
 
 
 if __name__ == "__main__":
     create_database()
-    add_hotwheels()
+    print(add_hotwheels())
     print("Database created successfully")
@@ -0,0 +1,30 @@
+from decimal import Decimal
+from fastapi.responses import JSONResponse
+from typing import Any, Sequence
+import orjson
+
+
+def _default(obj):
+    # Same representation pydantic uses for Decimal in JSON mode
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson-encoded response. Returning it from an endpoint skips the
+    response_model validation, so it is only meant for payloads built from
+    trusted database rows that already have the response_model's shape.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def rows_as_dicts(rows: Sequence, fields: Sequence[str]) -> list[dict]:
+    """
+    Turns column Rows into dicts keyed by `fields`, taken positionally;
+    trailing columns (like the count(*) OVER () total) are dropped.
+    """
+    return [dict(zip(fields, row)) for row in rows]
@@ -0,0 +1,176 @@
+from collections import OrderedDict, namedtuple
+from sqlalchemy import any_, bindparam, select, func
+from sqlalchemy.dialects.postgresql import ARRAY
+from src.hotwheels.models import Hotwheels
+from src import config
+from uuid import UUID
+import sys
+import time
+
+# Generated columns (the full-text search_vector) are not worth caching
+CATALOG_COLUMNS = [column for column in Hotwheels.__table__.columns if column.computed is None]
+
+# Immutable snapshot of a catalog row. Attribute access matches the ORM
+# model, so it validates against HotwheelsResponse/HotwheelsSearchResponse.
+CatalogRow = namedtuple("CatalogRow", [column.key for column in CATALOG_COLUMNS])
+
+
+def deep_sizeof(obj, seen=None) -> int:
+    """Approximate memory footprint of obj and everything it references."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+class CatalogStore:
+    """
+    Column-oriented copy of the whole catalog: one list per column plus an
+    id -> position index. Repeated strings (series, colors, countries...)
+    share a single object, which keeps the full catalog compact.
+    """
+
+    def __init__(self, rows):
+        interned = {}
+        columns = [[] for _ in CATALOG_COLUMNS]
+        index = {}
+        for position, row in enumerate(rows):
+            index[row[0]] = position
+            for column, value in zip(columns, row):
+                if isinstance(value, str):
+                    value = interned.setdefault(value, value)
+                column.append(value)
+        self.columns = columns
+        self.index = index
+
+    def __len__(self):
+        return len(self.index)
+
+    def get(self, hotwheels_id: UUID) -> CatalogRow | None:
+        position = self.index.get(hotwheels_id)
+        if position is None:
+            return None
+        return CatalogRow(*(column[position] for column in self.columns))
+
+
+class CatalogCache:
+    """
+    Read-through cache for the hotwheels catalog.
+
+    Rows are served from the preloaded CatalogStore when there is one, or
+    from an LRU keyed by UUID. max(update_at) is used as a version stamp:
+    it is checked at most every CATALOG_VERSION_CHECK_INTERVAL seconds and
+    any change drops the LRU and reloads the store.
+    """
+
+    def __init__(self, maxsize: int, check_interval: float):
+        self.maxsize = maxsize
+        self.check_interval = check_interval
+        self.lru: OrderedDict[UUID, CatalogRow] = OrderedDict()
+        self.store: CatalogStore | None = None
+        self.version = None
+        self.checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    async def _current_version(self, session):
+        return await session.scalar(select(func.max(Hotwheels.update_at)))
+
+    async def preload(self, session):
+        """Loads the full catalog into a CatalogStore."""
+        version = await self._current_version(session)
+        rows = (await session.execute(select(*CATALOG_COLUMNS))).all()
+        self.store = CatalogStore(rows)
+        self.lru.clear()
+        self.version = version
+        self.checked_at = time.monotonic()
+
+    async def refresh_if_stale(self, session):
+        now = time.monotonic()
+        if now - self.checked_at < self.check_interval:
+            return
+        self.checked_at = now
+        version = await self._current_version(session)
+        if version == self.version:
+            return
+        if self.store is not None:
+            await self.preload(session)
+        else:
+            self.lru.clear()
+            self.version = version
+
+    def _lookup(self, hotwheels_id: UUID) -> CatalogRow | None:
+        if self.store is not None:
+            row = self.store.get(hotwheels_id)
+            if row is not None:
+                return row
+        row = self.lru.get(hotwheels_id)
+        if row is not None:
+            self.lru.move_to_end(hotwheels_id)
+        return row
+
+    def _remember(self, row: CatalogRow):
+        self.lru[row.id] = row
+        self.lru.move_to_end(row.id)
+        while len(self.lru) > self.maxsize:
+            self.lru.popitem(last=False)
+
+    async def get(self, session, hotwheels_id: UUID) -> CatalogRow | None:
+        rows = await self.get_many(session, [hotwheels_id])
+        return rows.get(hotwheels_id)
+
+    async def get_many(self, session, hotwheels_ids) -> dict[UUID, CatalogRow]:
+        """Returns the rows found for the given ids; unknown ids are left out."""
+        await self.refresh_if_stale(session)
+
+        found = {}
+        missing = []
+        for hotwheels_id in hotwheels_ids:
+            row = self._lookup(hotwheels_id)
+            if row is None:
+                missing.append(hotwheels_id)
+            else:
+                found[hotwheels_id] = row
+        self.hits += len(found)
+        self.misses += len(missing)
+
+        if missing:
+            result = await session.execute(select(*CATALOG_COLUMNS).where(Hotwheels.id == any_(
+                bindparam("hotwheels_ids", missing, type_=ARRAY(Hotwheels.id.type))
+            )))
+            for values in result.all():
+                row = CatalogRow(*values)
+                self._remember(row)
+                found[row.id] = row
+        return found
+
+    def invalidate(self):
+        """Forces a version check on the next read."""
+        self.checked_at = 0.0
+
+    def stats(self, memory: bool = False) -> dict:
+        """Counters and sizes; `memory` adds the footprint (a walk of the whole cache)."""
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / (self.hits + self.misses), 4) if self.hits + self.misses else None,
+            "lru_size": len(self.lru),
+            "lru_capacity": self.maxsize,
+            "preloaded_rows": len(self.store) if self.store is not None else 0,
+            "version": self.version.isoformat() if self.version else None,
+        }
+        if memory:
+            stats["memory_bytes"] = {
+                "lru": deep_sizeof(self.lru),
+                "store": deep_sizeof(self.store.columns) + deep_sizeof(self.store.index) if self.store is not None else 0,
+            }
+        return stats
+
+
+catalog_cache = CatalogCache(config.CATALOG_CACHE_SIZE, config.CATALOG_VERSION_CHECK_INTERVAL)
@@ -0,0 +1,100 @@
+"""
+Natural key of catalog entries (`hotwheels.catalog_key`).
+
+The key is an md5 of the fields that identify a model, computed in SQL so
+the importer and the backfill of existing rows can never disagree.
+`ensure_catalog_key` brings databases created before the key up to date:
+it adds and backfills the column, merges the duplicate rows the old
+pandas loader appended (re-pointing ownership, wishlist and collection
+rows to the row that is kept) and only then builds the unique index.
+"""
+from sqlalchemy import text
+from src.user_hotwheels.market import rebuild_market
+
+NATURAL_KEY_COLUMNS = [
+    'model_name', 'series', 'release_year', 'collector_number', 'series_number', 'color', 'toy_number',
+]
+# Rows loaded by the old pandas to_sql path stored these as "12.0"
+FLOAT_TEXT_COLUMNS = {'collector_number', 'series_number'}
+
+
+def natural_key_sql(alias: str) -> str:
+    parts = []
+    for column in NATURAL_KEY_COLUMNS:
+        part = f"coalesce({alias}.{column}::text, '')"
+        if column in FLOAT_TEXT_COLUMNS:
+            part = f"regexp_replace({part}, '\\.0$', '')"
+        parts.append(part)
+    return f"md5(concat_ws('|', {', '.join(parts)}))"
+
+
+# For users (and wishlists) holding several copies of one model, only the
+# row on the kept model, or else on the lowest duplicate id, survives.
+DROP_SHADOWED = """
+    DELETE FROM {table} t USING catalog_duplicates d
+    WHERE t.hotwheels_id = d.id AND EXISTS (
+        SELECT 1 FROM {table} other
+        LEFT JOIN catalog_duplicates od ON od.id = other.hotwheels_id
+        WHERE other.user_id = t.user_id
+          AND coalesce(od.keep_id, other.hotwheels_id) = d.keep_id
+          AND (od.id IS NULL OR other.hotwheels_id < t.hotwheels_id)
+    )
+"""
+
+
+def merge_duplicates(connection) -> int:
+    """
+    Folds catalog rows sharing a key into the oldest one (then lowest id)
+    and returns how many rows were removed.
+    """
+    connection.execute(text("DROP TABLE IF EXISTS catalog_duplicates"))
+    connection.execute(text("""
+        CREATE TEMP TABLE catalog_duplicates AS
+        SELECT id, keep_id FROM (
+            SELECT id, first_value(id) OVER (
+                PARTITION BY catalog_key ORDER BY created_at NULLS LAST, id
+            ) AS keep_id
+            FROM hotwheels
+            WHERE catalog_key IN (SELECT catalog_key FROM hotwheels GROUP BY catalog_key HAVING count(*) > 1)
+        ) ranked
+        WHERE id <> keep_id
+    """))
+    merged = connection.execute(text("SELECT count(*) FROM catalog_duplicates")).scalar()
+    if merged:
+        for table in ("user_hotwheels", "wishlist"):
+            connection.execute(text(DROP_SHADOWED.format(table=table)))
+            connection.execute(text(
+                f"UPDATE {table} t SET hotwheels_id = d.keep_id FROM catalog_duplicates d WHERE t.hotwheels_id = d.id"
+            ))
+        connection.execute(text(
+            "UPDATE collection_item t SET hotwheel_id = d.keep_id FROM catalog_duplicates d WHERE t.hotwheel_id = d.id"
+        ))
+        connection.execute(text("""
+            UPDATE hotwheels h SET visit_count = h.visit_count + merged.visit_count
+            FROM (SELECT d.keep_id, sum(dup.visit_count) AS visit_count
+                  FROM catalog_duplicates d JOIN hotwheels dup ON dup.id = d.id
+                  GROUP BY d.keep_id) merged
+            WHERE h.id = merged.keep_id
+        """))
+        connection.execute(text(
+            "DELETE FROM hotwheels_market WHERE hotwheels_id IN (SELECT id FROM catalog_duplicates)"
+        ))
+        connection.execute(text("DELETE FROM hotwheels WHERE id IN (SELECT id FROM catalog_duplicates)"))
+        # The kept models now aggregate the sellers of their duplicates
+        rebuild_market(connection)
+    connection.execute(text("DROP TABLE catalog_duplicates"))
+    return merged
+
+
+def ensure_catalog_key(connection) -> int:
+    """
+    Adds, backfills and indexes catalog_key on a sync connection; returns
+    the number of duplicate catalog rows merged.
+    """
+    connection.execute(text("ALTER TABLE hotwheels ADD COLUMN IF NOT EXISTS catalog_key VARCHAR(32)"))
+    connection.execute(text(
+        f"UPDATE hotwheels SET catalog_key = {natural_key_sql('hotwheels')} WHERE catalog_key IS NULL"
+    ))
+    merged = merge_duplicates(connection)
+    connection.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS idx_hotwheels_catalog_key ON hotwheels (catalog_key)"))
+    return merged
@@ -0,0 +1,85 @@
+from sqlalchemy import func, select, tuple_
+from src.hotwheels.models import Hotwheels
+from src.ttl_cache import TTLCache
+from src import config
+
+facets_cache = TTLCache(config.FACETS_CACHE_TTL, config.FACETS_CACHE_SIZE)
+
+IS_TREASURE_HUNT = Hotwheels.treasure_hunt_year.is_not(None)
+IS_SUPER_TREASURE_HUNT = Hotwheels.super_treasure_hunt_year.is_not(None)
+
+# grouping(release_year, series, th, sth) bitmask of each grouping set
+# (a bit is set for every column the row is NOT grouped by)
+YEAR_SET, SERIES_SET, TH_SET, STH_SET, TOTAL_SET = 0b0111, 0b1011, 0b1101, 0b1110, 0b1111
+
+
+def facet_conditions(params) -> list:
+    """WHERE clauses for the HotwheelsSearchParams fields other than model_name."""
+    conditions = []
+    if params.release_year is not None:
+        conditions.append(Hotwheels.release_year == params.release_year)
+    if params.series:
+        conditions.append(Hotwheels.series == params.series)
+    if params.color:
+        conditions.append(Hotwheels.color.ilike(params.color))
+    if params.treasure_hunt is not None:
+        conditions.append(IS_TREASURE_HUNT if params.treasure_hunt else ~IS_TREASURE_HUNT)
+    if params.super_treasure_hunt is not None:
+        conditions.append(IS_SUPER_TREASURE_HUNT if params.super_treasure_hunt else ~IS_SUPER_TREASURE_HUNT)
+    return conditions
+
+
+async def facet_counts(session, conditions: list, cache_key: str) -> dict:
+    """
+    Total and per year / series / TH / STH counts of the rows matching
+    `conditions`, computed in a single scan with GROUPING SETS and cached
+    per filter for FACETS_CACHE_TTL seconds.
+    """
+    facets = facets_cache.get(cache_key)
+    if facets is not None:
+        return facets
+
+    grouping = func.grouping(Hotwheels.release_year, Hotwheels.series, IS_TREASURE_HUNT, IS_SUPER_TREASURE_HUNT)
+    query = (
+        select(
+            grouping.label("grouping_set"),
+            Hotwheels.release_year,
+            Hotwheels.series,
+            IS_TREASURE_HUNT.label("treasure_hunt"),
+            IS_SUPER_TREASURE_HUNT.label("super_treasure_hunt"),
+            func.count().label("count"),
+        )
+        .where(*conditions)
+        .group_by(func.grouping_sets(
+            tuple_(Hotwheels.release_year),
+            tuple_(Hotwheels.series),
+            tuple_(IS_TREASURE_HUNT),
+            tuple_(IS_SUPER_TREASURE_HUNT),
+            tuple_(),
+        ))
+    )
+
+    total, years, series, treasure_hunt, super_treasure_hunt = 0, [], [], 0, 0
+    for row in (await session.execute(query)).all():
+        if row.grouping_set == TOTAL_SET:
+            total = row.count
+        elif row.grouping_set == YEAR_SET:
+            years.append({"value": row.release_year, "count": row.count})
+        elif row.grouping_set == SERIES_SET:
+            series.append({"value": row.series, "count": row.count})
+        elif row.grouping_set == TH_SET and row.treasure_hunt:
+            treasure_hunt = row.count
+        elif row.grouping_set == STH_SET and row.super_treasure_hunt:
+            super_treasure_hunt = row.count
+
+    years.sort(key=lambda facet: (facet["value"] is None, -(facet["value"] or 0)))
+    series.sort(key=lambda facet: (-facet["count"], facet["value"] or ""))
+    facets = {
+        "total": total,
+        "release_year": years,
+        "series": series[:config.FACET_SERIES_LIMIT],
+        "treasure_hunt": treasure_hunt,
+        "super_treasure_hunt": super_treasure_hunt,
+    }
+    facets_cache.set(cache_key, facets)
+    return facets
@@ -0,0 +1,238 @@
+"""
+Streaming importer for the hotwheels catalog.
+
+Reads either the raw scraper export (JSONL, same fields the convert_data
+notebook consumed) or an already converted CSV (snake_case columns, like
+other/hotwheels.csv) in chunks, applies the notebook transforms, COPYs each
+chunk into a temporary staging table and upserts it into `hotwheels` on the
+natural key `catalog_key`. Re-running an import never duplicates rows, and
+rows whose data did not change keep their update_at (so the catalog cache
+is not invalidated needlessly).
+
+Usage:
+    python -m src.hotwheels.importer other/hotwheels.csv
+    python -m src.hotwheels.importer hotwheels.jsonl --chunk-size 20000
+"""
+from src.database import engine
+from src.hotwheels.catalog_key import ensure_catalog_key, natural_key_sql
+import argparse
+import csv
+import io
+import json
+import resource
+import time
+
+# Column mapping of the raw export (from convert_data.ipynb)
+COLUMN_MAPPING = {
+    'Model Name': 'model_name',
+    'Image URL': 'image_url',
+    'Collector #': 'collector_number',
+    'Series #': 'series_number',
+    'Release Year': 'release_year',
+    'Series': 'series',
+    'Color': 'color',
+    'Tampo': 'tampo',
+    'Wheel Type': 'wheel_type',
+    'Base Type': 'base_type',
+    'Base Color': 'base_color',
+    'Window Color': 'window_color',
+    'Interior Color': 'interior_color',
+    'Toy #': 'toy_number',
+    'Assortment #': 'assortment_number',
+    'Scale': 'scale',
+    'Country': 'country',
+    'Base Codes': 'base_codes',
+    'Case Number': 'case_number',
+    'Notes': 'notes',
+    'Treasure Hunt': 'treasure_hunt',
+}
+
+IMPORT_COLUMNS = [
+    'model_name', 'image_url', 'collector_number', 'series_number', 'release_year',
+    'series', 'color', 'tampo', 'wheel_type', 'base_type', 'base_color',
+    'window_color', 'interior_color', 'toy_number', 'assortment_number', 'scale',
+    'country', 'base_codes', 'case_number', 'notes', 'treasure_hunt_year',
+    'super_treasure_hunt_year',
+]
+INTEGER_COLUMNS = {'release_year', 'treasure_hunt_year', 'super_treasure_hunt_year'}
+
+def to_int(value):
+    """Same coercion as pd.to_numeric(errors='coerce').astype('Int64')."""
+    if value is None or value == "":
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def to_text(value):
+    if value is None:
+        return None
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return None
+        if value.is_integer():
+            value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+def extract_treasure_hunt_year(text):
+    if not text:
+        return None
+    return to_int(text.split(' ')[0]) if 'Treasure Hunts' in text and 'Super' not in text else None
+
+
+def extract_super_treasure_hunt_year(text):
+    if not text:
+        return None
+    return to_int(text.split(' ')[0]) if 'Super Treasure Hunts' in text else None
+
+
+def transform_raw(record: dict) -> dict | None:
+    """Applies the notebook transforms to one record of the raw export."""
+    row = {COLUMN_MAPPING[key]: value for key, value in record.items() if key in COLUMN_MAPPING}
+    if not to_text(row.get('model_name')):
+        return None
+    treasure_hunt = to_text(row.pop('treasure_hunt', None))
+    row['treasure_hunt_year'] = extract_treasure_hunt_year(treasure_hunt)
+    row['super_treasure_hunt_year'] = extract_super_treasure_hunt_year(treasure_hunt)
+    return row
+
+
+def normalize(row: dict) -> list:
+    return [
+        to_int(row.get(column)) if column in INTEGER_COLUMNS else to_text(row.get(column))
+        for column in IMPORT_COLUMNS
+    ]
+
+
+def read_rows(path: str):
+    """Yields normalized rows from a JSONL export or a converted CSV."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".jsonl") or path.endswith(".json"):
+            for line in f:
+                if not line.strip():
+                    continue
+                row = transform_raw(json.loads(line))
+                if row is not None:
+                    yield normalize(row)
+        else:
+            for record in csv.DictReader(f):
+                if 'Model Name' in record:
+                    record = transform_raw(record)
+                    if record is None:
+                        continue
+                if to_text(record.get('model_name')):
+                    yield normalize(record)
+
+
+def chunked(rows, size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def prepare(cursor):
+    """Creates the staging table; `line` keeps the file order of each chunk."""
+    columns = ", ".join(IMPORT_COLUMNS)
+    cursor.execute(
+        f"CREATE TEMP TABLE hotwheels_staging ON COMMIT DELETE ROWS AS "
+        f"SELECT {columns} FROM hotwheels WITH NO DATA"
+    )
+    cursor.execute("ALTER TABLE hotwheels_staging ADD COLUMN line BIGSERIAL")
+
+
+def copy_chunk(cursor, chunk):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(chunk)
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY hotwheels_staging ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+        buffer,
+    )
+
+
+def upsert_chunk(cursor) -> tuple[int, int, int]:
+    """
+    Moves the staged chunk into hotwheels; returns (inserted, updated,
+    duplicates). When a key repeats within the chunk, its last line wins.
+    """
+    columns = ", ".join(IMPORT_COLUMNS)
+    staged = ", ".join(f"s.{column}" for column in IMPORT_COLUMNS)
+    assignments = ", ".join(f"{column} = EXCLUDED.{column}" for column in IMPORT_COLUMNS)
+    current = ", ".join(f"hotwheels.{column}" for column in IMPORT_COLUMNS)
+    incoming = ", ".join(f"EXCLUDED.{column}" for column in IMPORT_COLUMNS)
+    cursor.execute(f"""
+        INSERT INTO hotwheels (id, {columns}, catalog_key, visit_count, created_at, update_at)
+        SELECT DISTINCT ON (key) gen_random_uuid(), {columns}, key, 0, now(), now()
+        FROM (SELECT {staged}, s.line, {natural_key_sql('s')} AS key FROM hotwheels_staging s) staged
+        ORDER BY key, line DESC
+        ON CONFLICT (catalog_key) DO UPDATE SET {assignments}, update_at = now()
+        WHERE ({current}) IS DISTINCT FROM ({incoming})
+        RETURNING (xmax = 0) AS inserted
+    """)
+    results = cursor.fetchall()
+    inserted = sum(1 for (was_inserted,) in results if was_inserted)
+    cursor.execute(f"SELECT count(*) - count(DISTINCT {natural_key_sql('s')}) FROM hotwheels_staging s")
+    duplicates = cursor.fetchone()[0]
+    return inserted, len(results) - inserted, duplicates
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def import_catalog(path: str, chunk_size: int = 10000, verbose: bool = True) -> dict:
+    started = time.perf_counter()
+    totals = {"rows": 0, "inserted": 0, "updated": 0, "duplicates": 0}
+
+    # Databases created before catalog_key get it (and lose the duplicate
+    # rows of the old loader) before anything is upserted on it
+    with engine.begin() as sql_connection:
+        totals["merged"] = ensure_catalog_key(sql_connection)
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        prepare(cursor)
+        connection.commit()
+
+        for chunk in chunked(read_rows(path), chunk_size):
+            copy_chunk(cursor, chunk)
+            inserted, updated, duplicates = upsert_chunk(cursor)
+            connection.commit()
+            totals["rows"] += len(chunk)
+            totals["inserted"] += inserted
+            totals["updated"] += updated
+            totals["duplicates"] += duplicates
+            if verbose:
+                print(f"{totals['rows']} rows read, {totals['inserted']} inserted, {totals['updated']} updated")
+        cursor.close()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+    elapsed = time.perf_counter() - started
+    totals["unchanged"] = totals["rows"] - totals["inserted"] - totals["updated"] - totals["duplicates"]
+    totals["seconds"] = round(elapsed, 2)
+    totals["rows_per_sec"] = round(totals["rows"] / elapsed, 1) if elapsed else None
+    totals["peak_rss_mb"] = peak_rss_mb()
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streams a hotwheels catalog file into the database.")
+    parser.add_argument("path", help="JSONL export or converted CSV")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args()
+    print(json.dumps(import_catalog(args.path, args.chunk_size), indent=2))
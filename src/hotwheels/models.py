@@ -1,9 +1,22 @@
-from sqlalchemy.orm import relationship
-from sqlalchemy import Column, Integer, String, UUID, TIMESTAMP, Index
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy import Column, Computed, Integer, String, UUID, TIMESTAMP, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
 from uuid import uuid4
 from src.base import Base
 
+# Documento da busca textual: pesos A (nome) > B (série, toy #, base codes) > C (tampo,
+# cor, ano) > D (notas). Configuração 'simple', sem stemming, para não
+# mutilar nomes de modelos e códigos.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(model_name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(series, '') || ' ' || coalesce(toy_number, '') || ' ' "
+    "|| coalesce(base_codes, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(tampo, '') || ' ' || coalesce(color, '') || ' ' "
+    "|| coalesce(release_year::text, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(notes, '')), 'D')"
+)
+
 
 class Hotwheels(Base):
     __tablename__ = "hotwheels"
@@ -32,6 +45,10 @@ class Hotwheels(Base):
     treasure_hunt_year = Column(Integer)
     super_treasure_hunt_year = Column(Integer)
     visit_count = Column(Integer, default=0, nullable=False)
+    # Chave natural (md5 dos campos de identificação), preenchida pelo importador
+    catalog_key = Column(String(32))
+    # Coluna gerada pelo Postgres; deferred para não ser lida junto com o modelo
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
     created_at = Column(TIMESTAMP, server_default=func.now())
     update_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
     
@@ -41,4 +58,14 @@ class Hotwheels(Base):
     
     __table_args__ = (
         Index('idx_hotwheels_model_name', model_name),
+        # Versão do catálogo para o cache em memória: max(update_at) via índice
+        Index('idx_hotwheels_update_at', update_at),
+        Index('idx_hotwheels_catalog_key', catalog_key, unique=True),
+        Index(
+            'idx_hotwheels_model_name_trgm',
+            model_name,
+            postgresql_using='gin',
+            postgresql_ops={'model_name': 'gin_trgm_ops'},
+        ),
+        Index('idx_hotwheels_search_vector', 'search_vector', postgresql_using='gin'),
     )
\ No newline at end of file
@@ -1,113 +1,373 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, or_, func, text
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select, or_, func, literal_column
 from typing import List
-from sqlalchemy.orm import Session
-from src.database import get_session
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database import get_async_session
 from src.hotwheels.models import Hotwheels
-from src.hotwheels.schemas import HotwheelsResponse, HotwheelsSearchResponse, PaginatedResponse, PaginationMeta
+from src.hotwheels.cache import catalog_cache
+from src.hotwheels.facets import facet_conditions, facet_counts
+from src.hotwheels.suggest import catalog_suggester
+from src.config import SUGGEST_MAX_LIMIT
+from src.visits import visit_counter
+from src.http_cache import CATALOG_POLICY, conditional, make_etag
+from src.user_hotwheels.models import HotwheelsMarket
+from src.user_hotwheels.market import MARKET_SCOPE
+from src.hotwheels.schemas import (
+    HotwheelsResponse,
+    HotwheelsSearchResponse,
+    HotwheelsBatchRequest,
+    HotwheelsBatchResponse,
+    PaginatedResponse,
+    PaginationMeta,
+    HotwheelsMarketResponse,
+    HotwheelsMarketListResponse,
+    HotwheelsSearchParams,
+    HotwheelsFacetedSearchResponse,
+    SearchMode,
+    HotwheelsSuggestResponse,
+)
+from src.pagination import fetch_page, is_cursor_for
+from src.totals import TotalMode
+from decimal import Decimal
 import uuid
 import math
+import re
 
 router = APIRouter()
 
+@router.post("/batch", response_model=HotwheelsBatchResponse)
+async def get_hotwheels_batch(
+    batch: HotwheelsBatchRequest,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Load several Hotwheels models at once.
+    Cached rows are served from memory; the rest come from a single
+    `id = ANY(...)` query. Results follow the request order (duplicates
+    collapsed) and unknown IDs are listed in `missing`.
+    """
+    ids = list(dict.fromkeys(batch.ids))
+    found = await catalog_cache.get_many(session, ids)
+
+    return HotwheelsBatchResponse(
+        items=[found[hotwheels_id] for hotwheels_id in ids if hotwheels_id in found],
+        missing=[hotwheels_id for hotwheels_id in ids if hotwheels_id not in found],
+    )
+
+@router.get("/suggest", response_model=HotwheelsSuggestResponse)
+async def suggest_hotwheels(
+    q: str = Query(..., min_length=1, max_length=100, description="What the user has typed so far"),
+    limit: int = Query(10, ge=1, le=SUGGEST_MAX_LIMIT),
+):
+    """
+    Typeahead over model names and series, matching any word by prefix.
+    Served from the in-memory index (no database access), most visited
+    first.
+    """
+    return HotwheelsSuggestResponse(items=[
+        suggestion._asdict() for suggestion in catalog_suggester.suggest(q, limit)
+    ])
+
+@router.get("/market/cheapest", response_model=HotwheelsMarketListResponse)
+async def get_cheapest_hotwheels(
+    skip: int = 0,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    total_mode: TotalMode = TotalMode.EXACT,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Models on sale, cheapest first.
+    Reads the precomputed market aggregates in (min_price, id) index order,
+    so no seller rows are scanned. Pass the returned next_cursor as cursor
+    to fetch the next page by key.
+    """
+    query = select(HotwheelsMarket, Hotwheels).join(Hotwheels, HotwheelsMarket.hotwheels_id == Hotwheels.id)
+    rows, total, total_mode, next_cursor = await fetch_page(
+        session,
+        query,
+        [(HotwheelsMarket.min_price, False, Decimal), (HotwheelsMarket.hotwheels_id, False, uuid.UUID)],
+        lambda row: [row.HotwheelsMarket.min_price, row.HotwheelsMarket.hotwheels_id],
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        scope=MARKET_SCOPE,
+        total_mode=total_mode,
+    )
+    items = [
+        {
+            **HotwheelsMarketResponse.model_validate(market).model_dump(),
+            "model_name": hotwheels.model_name,
+            "image_url": hotwheels.image_url,
+            "series": hotwheels.series,
+            "release_year": hotwheels.release_year,
+        }
+        for market, hotwheels, *_ in rows
+    ]
+    return {"total": total, "items": items, "next_cursor": next_cursor, "total_mode": total_mode}
+
+@router.get("/{id}/market", response_model=HotwheelsMarketResponse)
+async def get_hotwheels_market(id: uuid.UUID, session: AsyncSession = Depends(get_async_session)):
+    """Seller count, total quantity and min/avg/median price of the open sales of a model."""
+    market = await session.get(HotwheelsMarket, id)
+    if market:
+        return market
+    if not await catalog_cache.get(session, id):
+        raise HTTPException(status_code=404, detail="Hotwheels não encontrado.")
+    return HotwheelsMarketResponse(hotwheels_id=id)
+
 @router.get("/{id}", response_model=HotwheelsResponse)
-def get_specific_hotwheels(id: str, session: Session = Depends(get_session)):
+async def get_specific_hotwheels(
+    id: str,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Catalog entry by id. Carries an ETag and Last-Modified built from
+    update_at and answers conditional requests with 304; CDN and browser
+    caches may keep it for HTTP_CACHE_CATALOG_MAX_AGE seconds.
+    """
     try:
         uuid_id = uuid.UUID(id)
-        hotwheels = session.execute(select(Hotwheels).where(Hotwheels.id == uuid_id)).scalars().first()
     except ValueError:
         raise HTTPException(status_code=400, detail="ID inválido. Formato esperado: UUID.")
     
+    hotwheels = await catalog_cache.get(session, uuid_id)
     if hotwheels:
-        return hotwheels
+        visit_counter.hotwheels_viewed(uuid_id)
+        not_modified = conditional(
+            request,
+            response,
+            etag=make_etag(hotwheels.id, hotwheels.update_at),
+            last_modified=hotwheels.update_at,
+            cache_control=CATALOG_POLICY,
+        )
+        return not_modified or hotwheels
     raise HTTPException(status_code=404, detail="Hotwheels não encontrado.")
 
+async def _search_trigram(session, query, similarity_threshold, skip, page_size, cursor, scope, total_mode):
+    """Trigram match on model_name, best matches first."""
+    # pg_trgm and the GIN trigram index are created by create_database().
+    # The `%` operator can use that index; its cutoff comes from
+    # pg_trgm.similarity_threshold, set here for the current transaction only
+    # (the transaction-scoped equivalent of set_limit()).
+    await session.execute(
+        select(func.set_config("pg_trgm.similarity_threshold", str(similarity_threshold), True))
+    )
+
+    similarity = func.similarity(Hotwheels.model_name, query)
+    filtered = select(Hotwheels, similarity.label("score")).where(Hotwheels.model_name.op("%")(query))
+
+    return await fetch_page(
+        session,
+        filtered,
+        [(similarity, True, float), (Hotwheels.id, False, uuid.UUID)],
+        lambda row: [row.score, row.Hotwheels.id],
+        skip=skip,
+        limit=page_size,
+        cursor=cursor,
+        scope=scope,
+        total_mode=total_mode,
+    )
+
+
+async def _search_ilike(session, query, skip, page_size, cursor, scope, total_mode):
+    """ILIKE fallback for partial matches, in id order."""
+    filtered = select(Hotwheels).where(Hotwheels.model_name.ilike(f"%{query}%"))
+
+    return await fetch_page(
+        session,
+        filtered,
+        [(Hotwheels.id, False, uuid.UUID)],
+        lambda row: [row.Hotwheels.id],
+        skip=skip,
+        limit=page_size,
+        cursor=cursor,
+        scope=scope,
+        total_mode=total_mode,
+    )
+
+
+async def _search_fulltext(session, query, skip, page_size, cursor, scope, total_mode):
+    """
+    Full-text match on search_vector (GIN index), every word as a prefix,
+    ranked by ts_rank plus the trigram similarity of the model name.
+    """
+    words = re.findall(r"\w+", query.lower())
+    if not words:
+        return [], 0, total_mode, None
+    # Same text search configuration as SEARCH_VECTOR_SQL, inlined as a regconfig literal
+    tsquery = func.to_tsquery(literal_column("'simple'"), " & ".join(f"{word}:*" for word in words))
+
+    score = func.ts_rank(Hotwheels.search_vector, tsquery) + func.similarity(Hotwheels.model_name, query)
+    filtered = select(Hotwheels, score.label("score")).where(Hotwheels.search_vector.op("@@")(tsquery))
+
+    return await fetch_page(
+        session,
+        filtered,
+        [(score, True, float), (Hotwheels.id, False, uuid.UUID)],
+        lambda row: [row.score, row.Hotwheels.id],
+        skip=skip,
+        limit=page_size,
+        cursor=cursor,
+        scope=scope,
+        total_mode=total_mode,
+    )
+
+
 @router.get("/search/", response_model=PaginatedResponse[HotwheelsSearchResponse])
-def search_hotwheels(
+async def search_hotwheels(
     query: str = Query(None, min_length=2, description="Search query for model name"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     similarity_threshold: float = Query(0.3, ge=0.1, le=0.9, description="Similarity threshold for fuzzy search"),
-    session: Session = Depends(get_session)
+    cursor: str | None = Query(None, description="Opaque cursor from meta.next_cursor; takes precedence over page"),
+    total_mode: TotalMode = Query(TotalMode.CACHED, description="How meta.total_items is computed"),
+    mode: SearchMode = Query(SearchMode.FUZZY, description="fuzzy: model name only; fulltext: name, series, tampo, color, year and codes"),
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Search for Hotwheels models by name with typo tolerance.
     Performs a case-insensitive search with trigram similarity.
-    Supports pagination with page and page_size parameters.
+    With mode=fulltext, multi-word queries ("2019 red mustang") match
+    across the text fields and are ranked by ts_rank plus name
+    similarity; when nothing matches, the fuzzy search is used instead.
+    Supports pagination with page and page_size parameters, or with the
+    cursor returned in meta.next_cursor (keyset pagination, constant cost
+    for deep pages).
     Returns both results and pagination metadata.
     """
     if not query:
         raise HTTPException(status_code=400, detail="Search query is required")
     
-    # Calculate offset from page and page_size
+    trigram_scope = f"hotwheels-search:trgm:{query}:{similarity_threshold}"
+    ilike_scope = f"hotwheels-search:ilike:{query}"
+    ilike_cursor = cursor if cursor and is_cursor_for(ilike_scope, cursor) else None
+    fulltext_scope = f"hotwheels-search:fts:{query}"
+    use_fulltext = mode == SearchMode.FULLTEXT and (cursor is None or is_cursor_for(fulltext_scope, cursor))
+
+    # Calculate offset from page and page_size (ignored when a cursor is given)
     skip = (page - 1) * page_size
     
-    # Ensure pg_trgm extension is enabled (this should be done during DB setup,
-    # but we'll make sure it's available for our query)
     try:
-        session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
-        session.commit()
-        
-        # Get total count for pagination metadata
-        similarity_condition = func.similarity(Hotwheels.model_name, query) > similarity_threshold
-        count_query = select(func.count()).select_from(Hotwheels).where(similarity_condition)
-        total_items = session.execute(count_query).scalar() or 0
-        
-        # Query with pagination
-        stmt = select(Hotwheels).where(
-            similarity_condition
-        ).order_by(
-            func.similarity(Hotwheels.model_name, query).desc()
-        ).offset(skip).limit(page_size)
-        
-        results = session.execute(stmt).scalars().all()
-        
-        if not results and total_items == 0:
-            # If no results with similarity, try a fallback with ILIKE for partial matches
-            search_pattern = f"%{query}%"
-            fallback_condition = Hotwheels.model_name.ilike(search_pattern)
-            
-            # Get total count for fallback
-            count_query = select(func.count()).select_from(Hotwheels).where(fallback_condition)
-            total_items = session.execute(count_query).scalar() or 0
-            
-            fallback_stmt = select(Hotwheels).where(
-                fallback_condition
-            ).offset(skip).limit(page_size)
-            
-            results = session.execute(fallback_stmt).scalars().all()
+        rows = None
+        if use_fulltext:
+            rows, total_items, total_mode, next_cursor = await _search_fulltext(
+                session, query, skip, page_size, cursor, fulltext_scope, total_mode
+            )
+            if not rows and cursor is None and (total_items == 0 or skip == 0):
+                # Nothing matched every word: fall back to the fuzzy search
+                rows = None
+
+        if rows is None and ilike_cursor:
+            rows, total_items, total_mode, next_cursor = await _search_ilike(
+                session, query, skip, page_size, ilike_cursor, ilike_scope, total_mode
+            )
+        elif rows is None:
+            rows, total_items, total_mode, next_cursor = await _search_trigram(
+                session, query, similarity_threshold, skip, page_size, cursor, trigram_scope, total_mode
+            )
+            if not rows and (total_items == 0 or (skip == 0 and cursor is None)):
+                # If no results with similarity, try a fallback with ILIKE for partial matches
+                rows, total_items, total_mode, next_cursor = await _search_ilike(
+                    session, query, skip, page_size, None, ilike_scope, total_mode
+                )
+    except HTTPException:
+        raise
     except Exception:
         # Fallback if pg_trgm is not available
-        search_pattern = f"%{query}%"
-        fallback_condition = Hotwheels.model_name.ilike(search_pattern)
-        
-        # Get total count
-        count_query = select(func.count()).select_from(Hotwheels).where(fallback_condition)
-        total_items = session.execute(count_query).scalar() or 0
-        
-        stmt = select(Hotwheels).where(
-            fallback_condition
-        ).offset(skip).limit(page_size)
-        
-        results = session.execute(stmt).scalars().all()
+        await session.rollback()
+        rows, total_items, total_mode, next_cursor = await _search_ilike(
+            session, query, skip, page_size, ilike_cursor, ilike_scope, total_mode
+        )
     
+    results = [row.Hotwheels for row in rows]
     if not results:
         raise HTTPException(status_code=404, detail="No Hotwheels models found matching the search criteria")
     
     # Calculate pagination metadata
     total_pages = math.ceil(total_items / page_size) if total_items > 0 else 0
-    has_next = page < total_pages
-    has_prev = page > 1
     
     # Create pagination metadata
     meta = PaginationMeta(
         total_items=total_items,
         total_pages=total_pages,
-        current_page=page,
+        current_page=None if cursor else page,
         page_size=page_size,
-        has_next=has_next,
-        has_prev=has_prev
+        has_next=next_cursor is not None,
+        has_prev=cursor is not None or page > 1,
+        next_cursor=next_cursor,
+        total_mode=total_mode
     )
     
     # Return paginated response
-    return PaginatedResponse(items=results, meta=meta)
\ No newline at end of file
+    return PaginatedResponse(items=results, meta=meta)
+
+
+@router.get("/search/faceted", response_model=HotwheelsFacetedSearchResponse)
+async def search_hotwheels_faceted(
+    params: HotwheelsSearchParams = Depends(),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    similarity_threshold: float = Query(0.3, ge=0.1, le=0.9, description="Similarity threshold for the model_name match"),
+    cursor: str | None = Query(None, description="Opaque cursor from meta.next_cursor; takes precedence over page"),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Filter the catalog by release_year, series, color (case-insensitive)
+    and treasure hunt / super treasure hunt, optionally combined with the
+    trigram match on model_name (best matches first; newest first without
+    a name).
+    Returns the page plus facet counts per year, per series and TH/STH
+    for the whole result set. Facets come from one GROUPING SETS query,
+    cached per filter, which also provides meta.total_items.
+    """
+    conditions = facet_conditions(params)
+    name = params.model_name.strip() if params.model_name else None
+    if name:
+        # Same transaction-scoped threshold as search_hotwheels
+        await session.execute(
+            select(func.set_config("pg_trgm.similarity_threshold", str(similarity_threshold), True))
+        )
+        conditions.append(Hotwheels.model_name.op("%")(name))
+
+    scope = f"hotwheels-faceted:{params.model_dump_json()}:{similarity_threshold if name else ''}"
+    facets = await facet_counts(session, conditions, scope)
+
+    if name:
+        similarity = func.similarity(Hotwheels.model_name, name)
+        filtered = select(Hotwheels, similarity.label("score")).where(*conditions)
+        order_by = [(similarity, True, float), (Hotwheels.id, False, uuid.UUID)]
+        key = lambda row: [row.score, row.Hotwheels.id]
+    else:
+        year = func.coalesce(Hotwheels.release_year, 0)
+        filtered = select(Hotwheels, year.label("year")).where(*conditions)
+        order_by = [(year, True, int), (Hotwheels.id, False, uuid.UUID)]
+        key = lambda row: [row.year, row.Hotwheels.id]
+
+    skip = (page - 1) * page_size
+    rows, total_items, total_mode, next_cursor = await fetch_page(
+        session,
+        filtered,
+        order_by,
+        key,
+        skip=skip,
+        limit=page_size,
+        cursor=cursor,
+        scope=scope,
+        total_mode=TotalMode.CACHED,
+        known_total=facets["total"],
+    )
+
+    meta = PaginationMeta(
+        total_items=total_items,
+        total_pages=math.ceil(total_items / page_size) if total_items > 0 else 0,
+        current_page=None if cursor else page,
+        page_size=page_size,
+        has_next=next_cursor is not None,
+        has_prev=cursor is not None or page > 1,
+        next_cursor=next_cursor,
+        total_mode=total_mode
+    )
+    return HotwheelsFacetedSearchResponse(items=[row.Hotwheels for row in rows], meta=meta, facets=facets)
@@ -1,6 +1,10 @@
 from pydantic import BaseModel, Field, HttpUrl, UUID4
-from typing import List, Generic, TypeVar
+from typing import List
 from datetime import datetime
+from decimal import Decimal
+import enum
+from src.pagination import ListResponse, PaginationMeta, PaginatedResponse
+from src.config import HOTWHEELS_BATCH_MAX, SUGGEST_MAX_LIMIT
 
 class HotwheelsBase(BaseModel):
     """Base schema with common Hotwheels attributes"""
@@ -74,6 +78,11 @@ class HotwheelsSearchParams(BaseModel):
     treasure_hunt: bool | None = None
     super_treasure_hunt: bool | None = None
 
+class SearchMode(str, enum.Enum):
+    """How search_hotwheels matches the query"""
+    FUZZY = "fuzzy"  # trigram similarity on model_name, ILIKE fallback
+    FULLTEXT = "fulltext"  # tsvector over name/series/tampo/color/codes, ranked with ts_rank + similarity
+
 class HotwheelsSearchResponse(BaseModel):
     id: UUID4
     model_name: str
@@ -82,18 +91,58 @@ class HotwheelsSearchResponse(BaseModel):
     color: str | None
     release_year: int | None
 
-class PaginationMeta(BaseModel):
-    """Metadata for pagination"""
-    total_items: int
-    total_pages: int
-    current_page: int
-    page_size: int
-    has_next: bool
-    has_prev: bool
-
-T = TypeVar('T')
-
-class PaginatedResponse(BaseModel, Generic[T]):
-    """Generic paginated response with items and metadata"""
-    items: List[T]
-    meta: PaginationMeta
\ No newline at end of file
+class FacetCount(BaseModel):
+    value: int | str | None
+    count: int
+
+class HotwheelsFacets(BaseModel):
+    """Counts over every model matching the filters, not just the current page"""
+    release_year: List[FacetCount]
+    series: List[FacetCount] = Field(..., description="Most frequent series first (capped by FACET_SERIES_LIMIT)")
+    treasure_hunt: int
+    super_treasure_hunt: int
+
+class HotwheelsFacetedSearchResponse(PaginatedResponse[HotwheelsSearchResponse]):
+    """Search page plus the facet counts of the whole result set"""
+    facets: HotwheelsFacets
+
+class HotwheelsBatchRequest(BaseModel):
+    """IDs to load in a single round trip"""
+    ids: List[UUID4] = Field(..., min_length=1, max_length=HOTWHEELS_BATCH_MAX, description="Hotwheels IDs, in the order the results should follow")
+
+class HotwheelsBatchResponse(BaseModel):
+    """Models found, in request order, plus the IDs that do not exist"""
+    items: List[HotwheelsResponse]
+    missing: List[UUID4]
+
+class HotwheelsMarketResponse(BaseModel):
+    """Open sales of a model; prices are None when nobody is selling it"""
+    hotwheels_id: UUID4
+    seller_count: int = 0
+    total_quantity: int = 0
+    min_price: Decimal | None = None
+    avg_price: Decimal | None = None
+    median_price: Decimal | None = None
+    updated_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+class HotwheelsMarketListing(HotwheelsMarketResponse):
+    """Market aggregates with the model summary, for cheapest-first listings"""
+    model_name: str
+    image_url: str | None
+    series: str | None
+    release_year: int | None
+
+class HotwheelsMarketListResponse(ListResponse[HotwheelsMarketListing]):
+    pass
+
+class HotwheelsSuggestion(BaseModel):
+    text: str
+    kind: str = Field(..., description="model or series")
+    weight: int = Field(..., description="Total visit_count of the matching models")
+
+class HotwheelsSuggestResponse(BaseModel):
+    """Typeahead suggestions, most visited first"""
+    items: List[HotwheelsSuggestion]
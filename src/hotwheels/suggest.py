@@ -0,0 +1,159 @@
+from bisect import bisect_left
+from collections import namedtuple
+from sqlalchemy import select, func
+from src.hotwheels.models import Hotwheels
+from src import config
+import asyncio
+import heapq
+import logging
+import re
+import time
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+Suggestion = namedtuple("Suggestion", ["text", "kind", "weight"])
+
+
+def normalize(text: str) -> str:
+    """Lowercase, accents stripped, punctuation collapsed to single spaces."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(re.findall(r"[^\W_]+", text.lower()))
+
+
+class SuggestIndex:
+    """
+    Sorted array of normalized keys for prefix lookups with bisect. Every
+    word of a suggestion starts a key ("Ford Mustang" is found by "must"
+    too); top-k results per prefix are memoized, and precomputed for the
+    one- and two-character prefixes, whose ranges are the widest.
+    """
+
+    def __init__(self, suggestions: list[Suggestion]):
+        keys = []
+        for position, suggestion in enumerate(suggestions):
+            words = normalize(suggestion.text).split()
+            for i in range(len(words)):
+                keys.append((" ".join(words[i:]), position))
+        keys.sort()
+        self.keys = [key for key, _ in keys]
+        self.positions = [position for _, position in keys]
+        self.suggestions = suggestions
+        self.top: dict[str, list[int]] = {}
+        for length in (1, 2):
+            for prefix in sorted({key[:length] for key in self.keys}):
+                self.search(prefix, 0)
+
+    def __len__(self):
+        return len(self.suggestions)
+
+    def search(self, query: str, limit: int) -> list[Suggestion]:
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        top = self.top.get(prefix)
+        if top is None:
+            start = bisect_left(self.keys, prefix)
+            end = bisect_left(self.keys, prefix + "\uffff", start)
+            # Suggestions are sorted by text, so ties go alphabetically
+            top = heapq.nlargest(
+                config.SUGGEST_MAX_LIMIT,
+                set(self.positions[start:end]),
+                key=lambda position: (self.suggestions[position].weight, -position),
+            )
+            if len(self.top) < config.SUGGEST_CACHE_SIZE:
+                self.top[prefix] = top
+        return [self.suggestions[position] for position in top[:limit]]
+
+
+def build_suggestions(rows) -> list[Suggestion]:
+    """One suggestion per distinct model name and series, weighted by total visits."""
+    totals = {}
+    for model_name, series, visit_count in rows:
+        for text, kind in ((model_name, "model"), (series, "series")):
+            if not text:
+                continue
+            key = (normalize(text), kind)
+            if key[0]:
+                display, weight = totals.get(key, (text, 0))
+                totals[key] = (display, weight + (visit_count or 0))
+    suggestions = [Suggestion(display, kind, weight) for (_, kind), (display, weight) in totals.items()]
+    suggestions.sort(key=lambda suggestion: (normalize(suggestion.text), suggestion.kind))
+    return suggestions
+
+
+class CatalogSuggester:
+    """
+    Serves /hotwheels/suggest from memory. A background task builds the
+    index at startup, rebuilds it when the catalog version stamp
+    (max(update_at)) changes, and at least every SUGGEST_REWEIGHT_INTERVAL
+    seconds so the visit_count weights follow the flushed views. Requests
+    never touch the database; until the first build they get no results.
+    """
+
+    def __init__(self, refresh_interval: float, reweight_interval: float):
+        self.refresh_interval = refresh_interval
+        self.reweight_interval = reweight_interval
+        self.index = SuggestIndex([])
+        self.version = None
+        self.built_at = None
+        self.build_ms = None
+        self._task: asyncio.Task | None = None
+
+    def suggest(self, query: str, limit: int) -> list[Suggestion]:
+        return self.index.search(query, limit)
+
+    async def rebuild(self, session):
+        started = time.perf_counter()
+        version = await session.scalar(select(func.max(Hotwheels.update_at)))
+        rows = (await session.execute(
+            select(Hotwheels.model_name, Hotwheels.series, Hotwheels.visit_count)
+        )).all()
+        # Sorting and key building are CPU-bound; keep them off the event loop
+        self.index = await asyncio.to_thread(lambda: SuggestIndex(build_suggestions(rows)))
+        self.version = version
+        self.built_at = time.monotonic()
+        self.build_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    async def refresh_if_stale(self, session):
+        if self.built_at is not None and time.monotonic() - self.built_at < self.reweight_interval:
+            version = await session.scalar(select(func.max(Hotwheels.update_at)))
+            if version == self.version:
+                return
+        await self.rebuild(session)
+
+    async def _run(self, session_maker):
+        while True:
+            try:
+                async with session_maker() as session:
+                    await self.refresh_if_stale(session)
+            except Exception:
+                logger.exception("Suggest index refresh failed; serving the previous index")
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self, session_maker):
+        self._task = asyncio.create_task(self._run(session_maker))
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "suggestions": len(self.index),
+            "keys": len(self.index.keys),
+            "memoized_prefixes": len(self.index.top),
+            "version": self.version.isoformat() if self.version else None,
+            "age_seconds": round(time.monotonic() - self.built_at, 1) if self.built_at is not None else None,
+            "build_ms": self.build_ms,
+        }
+
+
+catalog_suggester = CatalogSuggester(config.SUGGEST_REFRESH_INTERVAL, config.SUGGEST_REWEIGHT_INTERVAL)
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+from src import config
+import hashlib
+
+# Cache-Control per kind of route
+CATALOG_POLICY = (
+    f"public, max-age={config.HTTP_CACHE_CATALOG_MAX_AGE}, "
+    f"stale-while-revalidate={config.HTTP_CACHE_CATALOG_STALE}"
+)
+# Profiles and wishlists change on user action: always revalidate (cheap with 304)
+PRIVATE_POLICY = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over the values that determine the representation."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # TIMESTAMP columns are naive and written by the server in UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/ prefixes are ignored
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # HTTP dates have second precision
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def conditional(
+    request: Request,
+    response: Response,
+    *,
+    etag: str,
+    cache_control: str,
+    last_modified: datetime | None = None,
+) -> Response | None:
+    """
+    Sets the validators and Cache-Control on `response`. Returns a bare 304
+    when the request's If-None-Match (or, without it, If-Modified-Since)
+    shows the client already has this version; the endpoint returns it as
+    is, so nothing is serialized. Only GET and HEAD are cacheable, so any
+    other method gets neither validators nor a 304.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        fresh = bool(if_modified_since and last_modified and _not_modified_since(if_modified_since, last_modified))
+    return Response(status_code=304, headers=headers) if fresh else None
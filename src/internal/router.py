@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from src.database import async_engine
+from src.pool_metrics import pool_stats
+from src.metrics import metrics
+from src.hotwheels.cache import catalog_cache
+from src.hotwheels.suggest import catalog_suggester
+from src.visits import visit_counter
+from src.rate_limit import load_shedder, rate_limiter
+from src.collections.ordering import rebalancer
+from src.auth.dependencies import require_internal_access
+
+# Both expose server internals: only the INTERNAL_TOKEN or an admin token
+router = APIRouter(dependencies=[Depends(require_internal_access)])
+# Served at the root (/metrics), where scrapers look by default
+metrics_router = APIRouter(dependencies=[Depends(require_internal_access)])
+
+
+@router.get("/pool")
+async def get_pool_stats():
+    """
+    Connection pool stats for the shared async engine: live gauges
+    (size, checked out, overflow) plus checkout counters and a wait-time
+    histogram in milliseconds.
+    """
+    return pool_stats.snapshot(async_engine.sync_engine.pool)
+
+
+@router.get("/catalog-cache")
+async def get_catalog_cache_stats(memory: bool = False):
+    """
+    Hit/miss counters and sizes of the catalog cache. With memory=true,
+    also its memory footprint, which walks every cached object.
+    """
+    return catalog_cache.stats(memory=memory)
+
+
+@router.get("/visits")
+async def get_visit_counter_stats():
+    """Views waiting for the next write-behind flush and views flushed so far."""
+    return visit_counter.stats()
+
+
+@router.get("/suggest")
+async def get_suggest_index_stats():
+    """Size, age and build time of the in-memory autocomplete index."""
+    return catalog_suggester.stats()
+
+
+@router.get("/limits")
+async def get_limit_stats():
+    """Rate limiter counters per rule and the load shedder's in-flight gauge."""
+    return {"rate_limit": rate_limiter.stats(), "load_shedding": load_shedder.stats()}
+
+
+@router.get("/collections")
+async def get_collection_rebalance_stats():
+    """Lists waiting for a background rebalance, and rebalances done so far."""
+    return rebalancer.stats()
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Request, SQL and connection pool metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        metrics.render(async_engine.sync_engine.pool),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -5,11 +5,59 @@ from src.collections.router import router as collections_router
 from src.user_hotwheels.router import router as user_hotwheels_router
 from src.wishlist.router import router as wishlist_router
 from src.users.router import router as users_router
+from src.internal.router import router as internal_router, metrics_router
+from src.database import async_session_maker
+from src.hotwheels.cache import catalog_cache
+from src.hotwheels.suggest import catalog_suggester
+from src.auth.utils import password_pool
+from src.visits import visit_counter
+from src.collections.ordering import rebalancer
+from src import config
+from contextlib import asynccontextmanager
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
+from src.compression import CompressionMiddleware
+from src.rate_limit import LoadSheddingMiddleware, RateLimitMiddleware, load_shedder, rate_limiter
+from src.metrics import MetricsMiddleware, metrics
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if config.CATALOG_PRELOAD:
+        async with async_session_maker() as session:
+            await catalog_cache.preload(session)
+    visit_counter.start(async_session_maker)
+    catalog_suggester.start(async_session_maker)
+    rebalancer.start(async_session_maker)
+    yield
+    await rebalancer.stop()
+    await catalog_suggester.stop()
+    await visit_counter.stop(async_session_maker)
+    password_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+if config.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=config.COMPRESSION_MIN_SIZE,
+        gzip_level=config.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=config.COMPRESSION_BROTLI_QUALITY,
+        content_types=config.COMPRESSION_CONTENT_TYPES,
+    )
+
+if config.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
+# Middleware added last runs first: CORS -> Metrics -> LoadShedding ->
+# RateLimit -> Compression -> routes. Shedding comes before any other work
+# but inside CORS, so 503/429 responses still carry the CORS headers
+app.add_middleware(LoadSheddingMiddleware, shedder=load_shedder)
+
+if config.METRICS_ENABLED:
+    # Wraps the shedding and rate limiting, so 503/429 responses are counted too
+    app.add_middleware(MetricsMiddleware, registry=metrics, server_timing=config.METRICS_SERVER_TIMING)
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,6 +74,8 @@ app.include_router(collections_router, prefix="/collections", tags=["collections
 app.include_router(user_hotwheels_router, prefix="/user_hotwheels", tags=["user_hotwheels"])
 app.include_router(wishlist_router, prefix="/wishlist", tags=["wishlist_router"])
 app.include_router(users_router, prefix="/users", tags=["users"])
+app.include_router(internal_router, prefix="/internal", tags=["internal"])
+app.include_router(metrics_router, tags=["internal"])
 
 if __name__ == "__main__":
     uvicorn.run("src.main:app")
@@ -0,0 +1,61 @@
+"""
+Owned / for sale / wishlisted flags of many models for one user, for
+the badges of a results page.
+
+Without the cache, each lookup is two `= ANY(...)` queries on the
+user_hotwheels and wishlist primary keys (user_id, hotwheels_id). With MEMBERSHIP_CACHE_ENABLED the
+user's whole sets are loaded once (same indexes, no ANY) and kept for
+MEMBERSHIP_CACHE_TTL seconds; the user_hotwheels and wishlist write
+handlers call `invalidate_membership` after committing.
+"""
+from collections import namedtuple
+from sqlalchemy import any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from src.user_hotwheels.models import UserHotwheels, UserHotwheelsModality
+from src.wishlist.models import Wishlist
+from src.ttl_cache import TTLCache
+from src import config
+
+MembershipSets = namedtuple("MembershipSets", ["owned", "for_sale", "wishlisted"])
+
+membership_cache = TTLCache(config.MEMBERSHIP_CACHE_TTL, config.MEMBERSHIP_CACHE_SIZE)
+
+
+def _only(column, hotwheels_ids):
+    return column == any_(bindparam("membership_ids", list(hotwheels_ids), type_=ARRAY(column.type)))
+
+
+async def _load(session, user_id, hotwheels_ids=None) -> MembershipSets:
+    """The user's sets, restricted to `hotwheels_ids` when given."""
+    owned_query = select(UserHotwheels.hotwheels_id, UserHotwheels.modality, UserHotwheels.sold).where(
+        UserHotwheels.user_id == user_id
+    )
+    wishlist_query = select(Wishlist.hotwheels_id).where(Wishlist.user_id == user_id)
+    if hotwheels_ids is not None:
+        owned_query = owned_query.where(_only(UserHotwheels.hotwheels_id, hotwheels_ids))
+        wishlist_query = wishlist_query.where(_only(Wishlist.hotwheels_id, hotwheels_ids))
+
+    owned = (await session.execute(owned_query)).all()
+    wishlisted = (await session.scalars(wishlist_query)).all()
+    return MembershipSets(
+        owned=frozenset(row.hotwheels_id for row in owned),
+        for_sale=frozenset(
+            row.hotwheels_id for row in owned if row.modality == UserHotwheelsModality.SALE and not row.sold
+        ),
+        wishlisted=frozenset(wishlisted),
+    )
+
+
+async def lookup_membership(session, user_id, hotwheels_ids: list) -> MembershipSets:
+    """The user's sets; they hold at least the requested models that belong to them."""
+    if not config.MEMBERSHIP_CACHE_ENABLED:
+        return await _load(session, user_id, hotwheels_ids)
+    sets = membership_cache.get(user_id)
+    if sets is None:
+        sets = await _load(session, user_id)
+        membership_cache.set(user_id, sets)
+    return sets
+
+
+def invalidate_membership(*user_ids):
+    membership_cache.invalidate(*user_ids)
@@ -0,0 +1,242 @@
+"""
+Request metrics in the Prometheus text format.
+
+`MetricsMiddleware` records, per route template and method, a latency
+histogram and the count of responses by status, plus a gauge of requests
+in flight. SQLAlchemy cursor events on the async engine add each query to
+the request that issued it (found through a context variable), giving
+per-route histograms of queries and database time per request; queries
+outside a request (background flushes and rebuilds) are only counted.
+`GET /metrics` (src/internal/router.py) renders all of it together with
+the connection pool stats. With METRICS_SERVER_TIMING, responses also
+carry a Server-Timing header with the request's total and database time,
+for local debugging.
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.pool_metrics import pool_stats
+import time
+
+# Upper bounds of the histogram buckets
+LATENCY_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float("inf"))
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, float("inf"))
+
+UNMATCHED = "unmatched"
+
+
+class Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+_current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+def _label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{name}="{_label_value(value)}"' for name, value in labels.items())
+
+
+def _bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else f"{bound:g}"
+
+
+class Metrics:
+    """Per-route counters and histograms; updated on the event loop only, so no locking."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.in_flight = 0
+        self.responses: dict[tuple[str, str, int], int] = {}
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.queries: dict[tuple[str, str], Histogram] = {}
+        self.db_time: dict[tuple[str, str], Histogram] = {}
+        self.queries_outside_requests = 0
+        self.db_seconds_outside_requests = 0.0
+
+    def record_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        key = (method, route)
+        self.responses[(method, route, status)] = self.responses.get((method, route, status), 0) + 1
+        for histograms, buckets, value in (
+            (self.latency, LATENCY_BUCKETS_S, seconds),
+            (self.queries, QUERY_BUCKETS, stats.queries),
+            (self.db_time, LATENCY_BUCKETS_S, stats.db_seconds),
+        ):
+            histogram = histograms.get(key)
+            if histogram is None:
+                histogram = histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def record_query(self, seconds: float):
+        stats = _current_request.get()
+        if stats is None:
+            self.queries_outside_requests += 1
+            self.db_seconds_outside_requests += seconds
+        else:
+            stats.queries += 1
+            stats.db_seconds += seconds
+
+    def _histogram_lines(self, name: str, help_text: str, histograms: dict) -> list[str]:
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (method, route), histogram in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                labels = _labels(method=method, route=route, le=_bound(bound))
+                lines.append(f"{name}_bucket{{{labels}}} {cumulative}")
+            labels = _labels(method=method, route=route)
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return lines
+
+    def _pool_lines(self, pool) -> list[str]:
+        snapshot = pool_stats.snapshot(pool)
+        lines = []
+        for name, key, help_text in (
+            ("db_pool_size", "size", "Connections kept by the pool"),
+            ("db_pool_checked_out", "checked_out", "Connections in use"),
+            ("db_pool_overflow", "overflow", "Connections above the pool size"),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {snapshot[key]}"]
+        for name, key, help_text in (
+            ("db_pool_checkouts_total", "checkouts", "Connection checkouts"),
+            ("db_pool_timeouts_total", "timeouts", "Checkouts that timed out waiting for a connection"),
+            ("db_pool_invalidations_total", "invalidations", "Connections invalidated"),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter", f"{name} {snapshot[key]}"]
+        wait = snapshot["wait_ms"]
+        name = "db_pool_checkout_wait_milliseconds"
+        lines += [f"# HELP {name} Time spent waiting for a connection", f"# TYPE {name} histogram"]
+        cumulative = 0
+        for bound, count in wait["buckets"].items():
+            cumulative += count
+            lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+        lines += [f"{name}_sum {wait['sum']}", f"{name}_count {wait['count']}"]
+        return lines
+
+    def render(self, pool=None) -> str:
+        lines = [
+            "# HELP http_requests_in_flight Requests being served",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_responses_total Responses by route, method and status",
+            "# TYPE http_responses_total counter",
+        ]
+        for (method, route, status), count in sorted(self.responses.items()):
+            lines.append(f"http_responses_total{{{_labels(method=method, route=route, status=status)}}} {count}")
+        lines += self._histogram_lines(
+            "http_request_duration_seconds", "Time to serve a request", self.latency
+        )
+        lines += self._histogram_lines(
+            "http_request_db_queries", "SQL statements executed per request", self.queries
+        )
+        lines += self._histogram_lines(
+            "http_request_db_duration_seconds", "Time spent in SQL statements per request", self.db_time
+        )
+        lines += [
+            "# HELP db_queries_outside_requests_total SQL statements run by background tasks",
+            "# TYPE db_queries_outside_requests_total counter",
+            f"db_queries_outside_requests_total {self.queries_outside_requests}",
+            "# HELP db_duration_outside_requests_seconds_total Time spent in SQL statements by background tasks",
+            "# TYPE db_duration_outside_requests_seconds_total counter",
+            f"db_duration_outside_requests_seconds_total {self.db_seconds_outside_requests:.6f}",
+        ]
+        if pool is not None:
+            lines += self._pool_lines(pool)
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+def instrument_queries(target):
+    """Registers the cursor event listeners that time every statement of an engine."""
+
+    @event.listens_for(target, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(target, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        metrics.record_query(time.perf_counter() - conn.info["query_started_at"].pop())
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the matched route (e.g. /hotwheels/{id}), so paths
+    with IDs share one series. Routes of included routers only know
+    their own part of the template; the router prefix is the literal head
+    of the request path, as long as the template has.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template is None:
+        return UNMATCHED
+    parts = scope["path"].split("/")
+    head = parts[:len(parts) - template.count("/")]
+    return "/".join(head) + template
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, registry: Metrics, server_timing: bool = False):
+        self.app = app
+        self.registry = registry
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        f'app;dur={elapsed_ms:.1f}, db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"',
+                    )
+            await send(message)
+
+        self.registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.registry.in_flight -= 1
+            _current_request.reset(token)
+            self.registry.record_request(
+                scope["method"], route_template(scope), status, time.perf_counter() - started, stats
+            )
+
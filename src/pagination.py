@@ -0,0 +1,164 @@
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import and_, or_
+from typing import Any, Callable, Generic, List, Sequence, TypeVar
+from src.totals import TotalMode, carried_total, resolve_total, with_total
+from src.config import CURSOR_SECRET
+import base64
+import hashlib
+import hmac
+import json
+
+T = TypeVar('T')
+
+
+class PaginationMeta(BaseModel):
+    """Metadata for pagination"""
+    total_items: int
+    total_pages: int
+    current_page: int | None
+    page_size: int
+    has_next: bool
+    has_prev: bool
+    next_cursor: str | None = None
+    total_mode: TotalMode = TotalMode.EXACT
+
+
+class PaginatedResponse(BaseModel, Generic[T]):
+    """Generic paginated response with items and metadata"""
+    items: List[T]
+    meta: PaginationMeta
+
+
+class ListResponse(BaseModel, Generic[T]):
+    """Generic skip/limit list response; next_cursor continues with keyset pagination"""
+    total: int
+    items: List[T]
+    next_cursor: str | None = None
+    total_mode: TotalMode = TotalMode.EXACT
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(scope: str, body: str) -> str:
+    digest = hmac.new(CURSOR_SECRET.encode("utf-8"), f"{scope}:{body}".encode("utf-8"), hashlib.sha256)
+    return _b64encode(digest.digest()[:16])
+
+
+def encode_cursor(scope: str, values: Sequence[Any]) -> str:
+    """
+    Encodes the sort key of the last row of a page into an opaque, signed
+    cursor. The scope (endpoint + filter) is part of the signature, so a
+    cursor cannot be replayed against another listing.
+    """
+    body = _b64encode(json.dumps(list(values), default=str, separators=(",", ":")).encode("utf-8"))
+    return f"{body}.{_sign(scope, body)}"
+
+
+def is_cursor_for(scope: str, cursor: str) -> bool:
+    """Tells whether a cursor was issued for the given scope."""
+    body, _, signature = cursor.partition(".")
+    return hmac.compare_digest(signature.encode("utf-8"), _sign(scope, body).encode("utf-8"))
+
+
+def decode_cursor(scope: str, cursor: str) -> list:
+    """Validates and decodes a cursor created by `encode_cursor` for the same scope."""
+    try:
+        if not is_cursor_for(scope, cursor):
+            raise ValueError("bad signature")
+        body = cursor.partition(".")[0]
+        values = json.loads(_b64decode(body))
+        if not isinstance(values, list):
+            raise ValueError("bad payload")
+        return values
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def read_cursor(scope: str, cursor: str, order_by: Sequence[tuple[Any, bool, Callable[[Any], Any]]]):
+    """
+    Decodes a `fetch_page` cursor into its keyset keys (column, value,
+    descending), the carried total and the total mode. A correctly signed
+    cursor can still hold values the parsers reject, which is a 400 too.
+    """
+    values = decode_cursor(scope, cursor)
+    try:
+        values, total, total_mode = carried_total(values)
+        if len(values) != len(order_by):
+            raise ValueError("bad sort key")
+        keys = [
+            (column, parse(value), descending)
+            for (column, descending, parse), value in zip(order_by, values)
+        ]
+    except (ValueError, TypeError, AttributeError, IndexError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return keys, total, total_mode
+
+
+def keyset_condition(keys: Sequence[tuple[Any, Any, bool]]):
+    """
+    Builds the WHERE clause that selects rows strictly after the given sort
+    key. Each key is (column, last_value, descending), in ORDER BY order.
+    """
+    clauses = []
+    for i, (column, value, descending) in enumerate(keys):
+        after = column < value if descending else column > value
+        clauses.append(and_(*[c == v for c, v, _ in keys[:i]], after))
+    return or_(*clauses)
+
+
+def paginate_rows(rows: Sequence, limit: int, scope: str, key: Callable[[Any], Sequence[Any]]):
+    """
+    Cuts rows fetched with `limit + 1` down to the page and builds the cursor
+    for the next page (None when this is the last one).
+    """
+    page = list(rows[:limit])
+    next_cursor = encode_cursor(scope, key(page[-1])) if len(rows) > limit and page else None
+    return page, next_cursor
+
+
+async def fetch_page(
+    session,
+    filtered,
+    order_by: Sequence[tuple[Any, bool, Callable[[Any], Any]]],
+    key: Callable[[Any], list],
+    *,
+    skip: int,
+    limit: int,
+    cursor: str | None,
+    scope: str,
+    total_mode: TotalMode,
+    known_total: int | None = None,
+):
+    """
+    Fetches one page of `filtered` with either offset or keyset pagination.
+
+    `order_by` lists (column, descending, parse) in sort order, where parse
+    turns a cursor value back into a bind value (e.g. UUID); `key` extracts
+    those values from a row. The first page resolves the total with
+    `total_mode` (or takes `known_total` when the caller already has it);
+    the cursors carry it along, so following pages never count.
+
+    Returns (rows, total, total_mode, next_cursor).
+    """
+    query = filtered.order_by(*[column.desc() if descending else column for column, descending, _ in order_by])
+
+    if cursor:
+        keys, total, total_mode = read_cursor(scope, cursor, order_by)
+        query = query.where(keyset_condition(keys))
+        rows = (await session.execute(query.limit(limit + 1))).all()
+    elif known_total is not None:
+        rows = (await session.execute(query.offset(skip).limit(limit + 1))).all()
+        total = known_total
+    else:
+        rows = (await session.execute(with_total(query, total_mode).offset(skip).limit(limit + 1))).all()
+        total = await resolve_total(session, total_mode, filtered, rows, skip, scope)
+
+    rows, next_cursor = paginate_rows(rows, limit, scope, lambda row: [*key(row), total, total_mode.value])
+    return rows, total, total_mode, next_cursor
@@ -0,0 +1,104 @@
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+import threading
+import time
+
+# Upper bounds (ms) of the checkout wait-time histogram buckets.
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+
+
+class PoolStats:
+    """Counters and checkout wait-time histogram for a connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connections_created = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.wait_count = 0
+            self.wait_sum_ms = 0.0
+            self.wait_max_ms = 0.0
+            self.wait_buckets = [0] * len(WAIT_BUCKETS_MS)
+
+    def record_wait(self, elapsed_ms: float):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_sum_ms += elapsed_ms
+            self.wait_max_ms = max(self.wait_max_ms, elapsed_ms)
+            for i, bound in enumerate(WAIT_BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    self.wait_buckets[i] += 1
+                    break
+
+    def record(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool) -> dict:
+        """Combines the live pool gauges with the accumulated counters."""
+        with self._lock:
+            buckets = {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(WAIT_BUCKETS_MS, self.wait_buckets)
+            }
+            return {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "connections_created": self.connections_created,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_ms": {
+                    "count": self.wait_count,
+                    "sum": round(self.wait_sum_ms, 3),
+                    "max": round(self.wait_max_ms, 3),
+                    "buckets": buckets,
+                },
+            }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times how long each checkout waits."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            pool_stats.record("timeouts")
+            raise
+        finally:
+            pool_stats.record_wait((time.perf_counter() - start) * 1000)
+
+
+def instrument_pool(target):
+    """Registers the pool event listeners that feed `pool_stats` on an engine or pool."""
+
+    @event.listens_for(target, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        pool_stats.record("connections_created")
+
+    @event.listens_for(target, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_stats.record("checkouts")
+
+    @event.listens_for(target, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        pool_stats.record("checkins")
+
+    @event.listens_for(target, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        pool_stats.record("invalidations")
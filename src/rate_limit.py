@@ -0,0 +1,210 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from src.auth.utils import decode_jwt_cached
+from src import config
+import abc
+import jwt
+import math
+import time
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Token bucket parameters: `requests` tokens, refilled over `seconds`."""
+    requests: int
+    seconds: float
+
+    @classmethod
+    def parse(cls, value: str) -> "Budget":
+        requests, _, seconds = value.partition("/")
+        return cls(int(requests), float(seconds or 1))
+
+    @property
+    def rate(self) -> float:
+        return self.requests / self.seconds
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    method: str | None
+    path_prefix: str
+    budget: Budget
+
+    def matches(self, method: str, path: str) -> bool:
+        return (self.method is None or self.method == method) and path.startswith(self.path_prefix)
+
+
+class RateLimitBackend(abc.ABC):
+    """
+    Storage for the buckets. The in-memory backend limits per process; a
+    shared store (e.g. Redis) only needs to implement `acquire`.
+    """
+
+    @abc.abstractmethod
+    async def acquire(self, key: str, budget: Budget) -> float:
+        """Takes one token; returns 0 when allowed, else seconds until a token is available."""
+
+
+class MemoryBackend(RateLimitBackend):
+    """Buckets in a bounded LRU dict; runs on the event loop, so no locking is needed."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self.buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def acquire(self, key: str, budget: Budget) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self.buckets.get(key, (budget.requests, now))
+        tokens = min(budget.requests, tokens + (now - updated_at) * budget.rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / budget.rate
+        self.buckets[key] = (tokens, now)
+        self.buckets.move_to_end(key)
+        while len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+        return wait
+
+
+def default_rules() -> list[Rule]:
+    """Tighter budgets for credential endpoints and search; the first matching rule applies."""
+    return [
+        Rule("login", "POST", "/auth/login", Budget.parse(config.RATE_LIMIT_LOGIN)),
+        Rule("register", "POST", "/auth/register", Budget.parse(config.RATE_LIMIT_REGISTER)),
+        Rule("search", "GET", "/hotwheels/search/", Budget.parse(config.RATE_LIMIT_SEARCH)),
+        Rule("default", None, "/", Budget.parse(config.RATE_LIMIT_DEFAULT)),
+    ]
+
+
+def client_identity(scope: Scope, trust_forwarded: bool) -> str:
+    """`sub` of a valid bearer token, otherwise the client IP."""
+    headers = Headers(scope=scope)
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            return f"sub:{decode_jwt_cached(token)['sub']}"
+        except (jwt.PyJWTError, KeyError):
+            pass
+    if trust_forwarded and "x-forwarded-for" in headers:
+        return "ip:" + headers["x-forwarded-for"].split(",")[0].strip()
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimiter:
+    """Matches a request to its rule and spends one token of the client's bucket."""
+
+    def __init__(self, backend: RateLimitBackend, rules: list[Rule], trust_forwarded: bool = False):
+        self.backend = backend
+        self.rules = rules
+        self.trust_forwarded = trust_forwarded
+        self.allowed = 0
+        self.limited: dict[str, int] = {rule.name: 0 for rule in rules}
+
+    async def check(self, scope: Scope) -> float:
+        """0 when the request may proceed, else the seconds to wait."""
+        rule = next((rule for rule in self.rules if rule.matches(scope["method"], scope["path"])), None)
+        if rule is None:
+            return 0.0
+        identity = client_identity(scope, self.trust_forwarded)
+        wait = await self.backend.acquire(f"{rule.name}:{identity}", rule.budget)
+        if wait > 0:
+            self.limited[rule.name] += 1
+        else:
+            self.allowed += 1
+        return wait
+
+    def stats(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "budgets": {rule.name: f"{rule.budget.requests}/{rule.budget.seconds:g}s" for rule in self.rules},
+        }
+
+
+class RateLimitMiddleware:
+    """Answers 429 with Retry-After once a client runs out of tokens for the route's budget."""
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        wait = await self.limiter.check(scope)
+        if wait > 0:
+            response = JSONResponse(
+                {"detail": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+class LoadShedder:
+    """In-flight request gauge; 0 as the limit disables shedding."""
+
+    def __init__(self, max_in_flight: int, retry_after: int):
+        self.max_in_flight = max_in_flight
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.shed = 0
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "max_in_flight": self.max_in_flight,
+            "shed": self.shed,
+        }
+
+
+class LoadSheddingMiddleware:
+    """
+    Answers 503 with Retry-After, before any work is done, while the
+    shedder's limit of in-flight requests is reached. Paths under
+    `exempt_prefixes` (the internal stats and metrics) are always served.
+    """
+
+    def __init__(self, app: ASGIApp, shedder: LoadShedder, exempt_prefixes: tuple = ("/internal", "/metrics")):
+        self.app = app
+        self.shedder = shedder
+        self.exempt_prefixes = exempt_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_prefixes):
+            await self.app(scope, receive, send)
+            return
+        shedder = self.shedder
+        if shedder.max_in_flight and shedder.in_flight >= shedder.max_in_flight:
+            shedder.shed += 1
+            response = JSONResponse(
+                {"detail": "Server overloaded, try again later"},
+                status_code=503,
+                headers={"Retry-After": str(shedder.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        shedder.in_flight += 1
+        shedder.peak_in_flight = max(shedder.peak_in_flight, shedder.in_flight)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            shedder.in_flight -= 1
+
+
+rate_limiter = RateLimiter(
+    MemoryBackend(config.RATE_LIMIT_MAX_KEYS), default_rules(), config.RATE_LIMIT_TRUST_FORWARDED
+)
+load_shedder = LoadShedder(config.LOAD_SHED_MAX_IN_FLIGHT, config.LOAD_SHED_RETRY_AFTER)
@@ -0,0 +1,70 @@
+from sqlalchemy import func, select
+from src.config import TOTALS_CACHE_SIZE, TOTALS_CACHE_TTL
+from src.ttl_cache import TTLCache
+import enum
+import json
+
+TOTAL_COUNT_LABEL = "total_count"
+
+
+class TotalMode(str, enum.Enum):
+    """How the total of a paginated listing is produced."""
+    EXACT = "exact"  # count(*) OVER () in the page query itself
+    ESTIMATED = "estimated"  # planner row estimate from EXPLAIN
+    CACHED = "cached"  # exact count, memoized per filter for TOTALS_CACHE_TTL seconds
+
+
+totals_cache = TTLCache(TOTALS_CACHE_TTL, TOTALS_CACHE_SIZE)
+
+
+def with_total(query, mode: TotalMode):
+    """Adds the count(*) OVER () column to the page query when the mode is exact."""
+    if mode == TotalMode.EXACT:
+        return query.add_columns(func.count().over().label(TOTAL_COUNT_LABEL))
+    return query
+
+
+async def exact_count(session, filtered) -> int:
+    return await session.scalar(select(func.count()).select_from(filtered.order_by(None).subquery())) or 0
+
+
+async def estimated_count(session, filtered) -> int:
+    """Row estimate of the planner for the filtered statement (no scan)."""
+    sql = str(filtered.order_by(None).compile(
+        dialect=session.bind.dialect, compile_kwargs={"literal_binds": True}
+    ))
+    connection = await session.connection()
+    plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def resolve_total(session, mode: TotalMode, filtered, rows, skip: int, cache_key: str) -> int:
+    """
+    Produces the total for a page fetched with `with_total(query, mode)`.
+
+    `filtered` is the listing statement without pagination; it is only
+    counted when the mode needs it (cache miss, or an exact-mode page past
+    the end where the window column is not available).
+    """
+    if mode == TotalMode.EXACT:
+        if rows:
+            return rows[0]._mapping[TOTAL_COUNT_LABEL]
+        if skip == 0:
+            return 0
+        return await exact_count(session, filtered)
+
+    if mode == TotalMode.ESTIMATED:
+        return await estimated_count(session, filtered)
+
+    total = totals_cache.get(cache_key)
+    if total is None:
+        total = await exact_count(session, filtered)
+        totals_cache.set(cache_key, total)
+    return total
+
+
+def carried_total(values: list) -> tuple[list, int, TotalMode]:
+    """Splits a decoded cursor into its sort key and the total carried from the first page."""
+    return values[:-2], values[-2], TotalMode(values[-1])
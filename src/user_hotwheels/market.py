@@ -0,0 +1,96 @@
+"""
+Marketplace price index.
+
+`hotwheels_market` keeps one row per model with at least one open sale
+(modality SALE, not sold, seller active): seller count, total quantity and
+min/avg/median price. Writes to user_hotwheels call `refresh_market` for
+the affected models inside their own transaction, so the aggregate is
+recomputed from that model's sellers only and commits together with the
+change. Refreshes of one model are serialized with a transaction-level
+advisory lock, so the last writer's aggregate always includes the
+changes committed before it. `rebuild_market` recomputes the whole table (schema creation,
+backfills).
+"""
+from sqlalchemy import Numeric, Text, any_, bindparam, delete, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from src.auth.models import User
+from src.user_hotwheels.models import HotwheelsMarket, UserHotwheels, UserHotwheelsModality
+from src.totals import totals_cache
+
+MARKET_SCOPE = "hotwheels-market:cheapest"
+
+
+def _aggregate(hotwheels_ids=None):
+    query = (
+        select(
+            UserHotwheels.hotwheels_id,
+            func.count().label("seller_count"),
+            func.coalesce(func.sum(UserHotwheels.quantity), 0).label("total_quantity"),
+            func.min(UserHotwheels.price).label("min_price"),
+            func.round(func.avg(UserHotwheels.price), 2).label("avg_price"),
+            func.percentile_cont(0.5).within_group(UserHotwheels.price).cast(Numeric(10, 2)).label("median_price"),
+        )
+        .join(User, UserHotwheels.user_id == User.id)
+        .where(
+            UserHotwheels.modality == UserHotwheelsModality.SALE,
+            UserHotwheels.sold == False,
+            User.is_active == True,
+        )
+        .group_by(UserHotwheels.hotwheels_id)
+    )
+    if hotwheels_ids is not None:
+        query = query.where(UserHotwheels.hotwheels_id == any_(
+            bindparam("market_hotwheels_ids", list(hotwheels_ids), type_=ARRAY(UserHotwheels.hotwheels_id.type))
+        ))
+    return query
+
+
+def _upsert(hotwheels_ids=None):
+    columns = ["hotwheels_id", "seller_count", "total_quantity", "min_price", "avg_price", "median_price"]
+    statement = insert(HotwheelsMarket).from_select(columns, _aggregate(hotwheels_ids))
+    return statement.on_conflict_do_update(
+        index_elements=[HotwheelsMarket.hotwheels_id],
+        set_={**{column: statement.excluded[column] for column in columns[1:]}, "updated_at": func.now()},
+    ).returning(HotwheelsMarket.hotwheels_id)
+
+
+async def lock_market(session, hotwheels_ids):
+    """
+    Holds the models' market locks until the transaction ends. Without it,
+    two concurrent writers each aggregate without the other's uncommitted
+    row and the last commit leaves a stale aggregate. The locks are taken
+    in id order, so bulk writes over overlapping models cannot deadlock.
+    """
+    keys = [f"market:{hotwheels_id}" for hotwheels_id in sorted(hotwheels_ids)]
+    key = func.unnest(bindparam("market_lock_keys", keys, type_=ARRAY(Text))).column_valued("key")
+    await session.execute(select(func.pg_advisory_xact_lock(func.hashtextextended(key, 0))))
+
+
+async def refresh_market(session, *hotwheels_ids):
+    """Recomputes the aggregates of the given models; call before committing the change."""
+    hotwheels_ids = set(hotwheels_ids)
+    if not hotwheels_ids:
+        return
+    # A statement of its own: under READ COMMITTED the aggregate below then
+    # takes its snapshot after the previous holder of the lock committed
+    await lock_market(session, hotwheels_ids)
+    refreshed = set((await session.scalars(_upsert(hotwheels_ids))).all())
+    closed = hotwheels_ids - refreshed
+    if closed:
+        await session.execute(delete(HotwheelsMarket).where(HotwheelsMarket.hotwheels_id.in_(closed)))
+    totals_cache.invalidate(MARKET_SCOPE)
+
+
+async def refresh_user_market(session, user_id):
+    """Recomputes every model the user has for sale (e.g. after is_active changes)."""
+    hotwheels_ids = (await session.scalars(select(UserHotwheels.hotwheels_id).where(
+        UserHotwheels.user_id == user_id,
+        UserHotwheels.modality == UserHotwheelsModality.SALE,
+    ))).all()
+    await refresh_market(session, *hotwheels_ids)
+
+
+def rebuild_market(connection):
+    """Recomputes the whole table on a sync connection."""
+    connection.execute(delete(HotwheelsMarket))
+    connection.execute(_upsert())
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, String, UUID, TIMESTAMP, ForeignKey, Boolean, Enum, DECIMAL, Integer
+from sqlalchemy import Column, String, UUID, TIMESTAMP, ForeignKey, Boolean, Enum, DECIMAL, Integer, Index
 from sqlalchemy.sql import func
 from src.base import Base
 import enum
@@ -26,4 +26,43 @@ class UserHotwheels(Base):
     update_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
     
     user = relationship("User", back_populates="user_hotwheels")
-    hotwheels = relationship("Hotwheels", back_populates="user_hotwheels")
\ No newline at end of file
+    hotwheels = relationship("Hotwheels", back_populates="user_hotwheels")
+
+    # A PK (user_id, hotwheels_id) atende as buscas por usuário, inclusive a
+    # de membership; os índices abaixo são para as buscas por modelo
+    __table_args__ = (
+        # Donos de um modelo (get_hotwheels_users), em ordem de user_id
+        Index('idx_user_hotwheels_hotwheels_user', hotwheels_id, user_id),
+        # Vendedores de um modelo (get_hotwheels_sellers), sem ler as linhas de coleção
+        Index(
+            'idx_user_hotwheels_sellers',
+            hotwheels_id, user_id,
+            postgresql_include=['price', 'quantity', 'sold', 'is_negotiable'],
+            postgresql_where=(modality == UserHotwheelsModality.SALE),
+        ),
+        # Vendas em aberto, para o índice de preços (index-only scan)
+        Index(
+            'idx_user_hotwheels_open_sales',
+            hotwheels_id,
+            postgresql_include=['user_id', 'price', 'quantity'],
+            postgresql_where=(modality == UserHotwheelsModality.SALE) & ~sold,
+        ),
+    )
+
+
+class HotwheelsMarket(Base):
+    """Precomputed SALE aggregates per model, maintained by src/user_hotwheels/market.py"""
+    __tablename__ = "hotwheels_market"
+
+    hotwheels_id = Column(UUID(as_uuid=True), ForeignKey("hotwheels.id"), primary_key=True)
+    seller_count = Column(Integer, nullable=False, default=0)
+    total_quantity = Column(Integer, nullable=False, default=0)
+    min_price = Column(DECIMAL(10, 2), nullable=False)
+    avg_price = Column(DECIMAL(10, 2), nullable=False)
+    median_price = Column(DECIMAL(10, 2), nullable=False)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # "Mais baratos primeiro" sem varrer os vendedores
+        Index('idx_hotwheels_market_min_price', min_price, hotwheels_id),
+    )
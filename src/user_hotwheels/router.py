@@ -1,6 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import any_, bindparam, column, delete, func, literal_column, select, update, values
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from collections import Counter
 from src.user_hotwheels.schemas import (
     UserHotwheelsCreate,
     UserHotwheelsResponse,
@@ -9,28 +12,100 @@ from src.user_hotwheels.schemas import (
     HotwheelsCardInfo,
     UserHotwheelsCardListResponse,
     HotwheelsSellersResponse,
+    BulkConflict,
+    BulkStatus,
+    UserHotwheelsBulkCreate,
+    UserHotwheelsBulkUpdate,
+    UserHotwheelsBulkDelete,
+    UserHotwheelsBulkResponse,
 )
 from src.user_hotwheels.models import UserHotwheels, UserHotwheelsModality
+from src.user_hotwheels.market import refresh_market
 from src.hotwheels.models import Hotwheels
+from src.hotwheels.cache import catalog_cache
+from src.membership import invalidate_membership
+from src.visits import visit_counter
 from src.auth.models import User
-from src.database import get_session
+from src.database import get_async_session
+from src.pagination import fetch_page
+from src.totals import TotalMode, totals_cache
+from src.fast_json import FastJSONResponse, rows_as_dicts
+from src import config
 from uuid import UUID
 
 router = APIRouter()
 
+# Columns selected straight into the card/seller shapes, in response field order
+CARD_COLUMNS = [
+    Hotwheels.id,
+    Hotwheels.model_name,
+    Hotwheels.image_url,
+    Hotwheels.collector_number,
+    Hotwheels.series,
+    Hotwheels.color,
+    Hotwheels.release_year,
+    UserHotwheels.modality,
+    UserHotwheels.favorite,
+    UserHotwheels.price,
+    UserHotwheels.description,
+    UserHotwheels.sold,
+    UserHotwheels.quantity,
+    UserHotwheels.is_negotiable,
+    UserHotwheels.visit_count,
+]
+CARD_FIELDS = [column.key for column in CARD_COLUMNS]
+
+SELLER_COLUMNS = [
+    UserHotwheels.user_id,
+    User.nickname,
+    User.avatar_url,
+    UserHotwheels.price,
+    UserHotwheels.is_negotiable,
+    UserHotwheels.description,
+    User.state,
+    User.city,
+    User.cep,
+    UserHotwheels.quantity,
+    UserHotwheels.sold,
+]
+SELLER_FIELDS = [column.key for column in SELLER_COLUMNS]
+
+# Fields a bulk item may set, and what a new row gets for the ones left out
+BULK_FIELDS = list(UserHotwheelsUpdate.model_fields)
+BULK_DEFAULTS = {
+    name: UserHotwheels.__table__.c[name].default.arg if UserHotwheels.__table__.c[name].default is not None else None
+    for name in BULK_FIELDS
+}
+
+
+def list_response(items: list, total: int, next_cursor: str | None, total_mode: TotalMode):
+    """
+    ListResponse payload. With FAST_JSON_RESPONSES the rows go straight to
+    orjson instead of being validated again against the response_model.
+    """
+    payload = {"total": total, "items": items, "next_cursor": next_cursor, "total_mode": total_mode}
+    if config.FAST_JSON_RESPONSES:
+        return FastJSONResponse(payload)
+    return payload
+
+
+def invalidate_cached_totals(user_id: UUID, hotwheels_id: UUID):
+    """Drops the cached totals of every listing that a user_hotwheels row appears in."""
+    totals_cache.invalidate(
+        f"user-hotwheels:{user_id}",
+        f"user-hotwheels-cards:{user_id}",
+        f"hotwheels-users:{hotwheels_id}",
+        f"hotwheels-sellers:{hotwheels_id}",
+    )
+
 
 @router.post("/", response_model=UserHotwheelsResponse)
 async def create_user_hotwheels(
-    user_hotwheels: UserHotwheelsCreate, db: Session = Depends(get_session)
+    user_hotwheels: UserHotwheelsCreate, db: AsyncSession = Depends(get_async_session)
 ):
     # Check if the combination already exists
-    existing = (
-        db.query(UserHotwheels)
-        .filter(
-            UserHotwheels.user_id == user_hotwheels.user_id,
-            UserHotwheels.hotwheels_id == user_hotwheels.hotwheels_id,
-        )
-        .first()
+    existing = await db.get(
+        UserHotwheels, (user_hotwheels.user_id, user_hotwheels.hotwheels_id)
     )
 
     if existing:
@@ -42,18 +117,21 @@ async def create_user_hotwheels(
     try:
         db_user_hotwheels = UserHotwheels(**user_hotwheels.model_dump())
         db.add(db_user_hotwheels)
-        db.commit()
-        db.refresh(db_user_hotwheels)
+        await refresh_market(db, db_user_hotwheels.hotwheels_id)
+        await db.commit()
+        await db.refresh(db_user_hotwheels)
+        invalidate_cached_totals(db_user_hotwheels.user_id, db_user_hotwheels.hotwheels_id)
+        invalidate_membership(db_user_hotwheels.user_id)
         return db_user_hotwheels
 
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid user_id or hotwheels_id",
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while creating the record",
@@ -65,18 +143,23 @@ async def get_user_hotwheels(
     user_id: UUID,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_session),
+    cursor: str | None = None,
+    total_mode: TotalMode = TotalMode.EXACT,
+    db: AsyncSession = Depends(get_async_session),
 ):
-    total = db.query(UserHotwheels).filter(UserHotwheels.user_id == user_id).count()
-    items = (
-        db.query(UserHotwheels)
-        .filter(UserHotwheels.user_id == user_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    rows, total, total_mode, next_cursor = await fetch_page(
+        db,
+        select(UserHotwheels).where(UserHotwheels.user_id == user_id),
+        [(UserHotwheels.hotwheels_id, False, UUID)],
+        lambda row: [row.UserHotwheels.hotwheels_id],
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        scope=f"user-hotwheels:{user_id}",
+        total_mode=total_mode,
     )
-
-    return {"total": total, "items": items}
+    items = [row.UserHotwheels for row in rows]
+    return {"total": total, "items": items, "next_cursor": next_cursor, "total_mode": total_mode}
 
 
 @router.get("/hotwheels/{hotwheels_id}", response_model=UserHotwheelsListResponse)
@@ -84,66 +167,75 @@ async def get_hotwheels_users(
     hotwheels_id: UUID,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_session),
+    cursor: str | None = None,
+    total_mode: TotalMode = TotalMode.EXACT,
+    db: AsyncSession = Depends(get_async_session),
 ):
-    total = (
-        db.query(UserHotwheels)
-        .filter(UserHotwheels.hotwheels_id == hotwheels_id)
-        .count()
-    )
-    items = (
-        db.query(UserHotwheels)
-        .filter(UserHotwheels.hotwheels_id == hotwheels_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    rows, total, total_mode, next_cursor = await fetch_page(
+        db,
+        select(UserHotwheels).where(UserHotwheels.hotwheels_id == hotwheels_id),
+        [(UserHotwheels.user_id, False, UUID)],
+        lambda row: [row.UserHotwheels.user_id],
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        scope=f"hotwheels-users:{hotwheels_id}",
+        total_mode=total_mode,
     )
+    items = [row.UserHotwheels for row in rows]
 
-    return {"total": total, "items": items}
+    return {"total": total, "items": items, "next_cursor": next_cursor, "total_mode": total_mode}
 
 
 @router.get("/check/{user_id}/{hotwheels_id}", response_model=UserHotwheelsResponse)
 async def check_user_has_hotwheels(
     user_id: UUID,
     hotwheels_id: UUID,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
 ):
-    exists = (
-        db.query(UserHotwheels)
-        .filter(
-            UserHotwheels.user_id == user_id,
-            UserHotwheels.hotwheels_id == hotwheels_id,
-        )
-        .first()
-    )
+    """Ownership probe for a card badge; not a listing view, so nothing is counted."""
+    exists = await db.get(UserHotwheels, (user_id, hotwheels_id))
     
     if not exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="UserHotwheels item not found",
         )
-        
     return exists
 
 
-@router.delete("/{user_id}/{hotwheels_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user_hotwheels_item(
-    user_id: UUID, hotwheels_id: UUID, db: Session = Depends(get_session)
+@router.get("/{user_id}/{hotwheels_id}", response_model=UserHotwheelsResponse)
+async def get_user_hotwheels_item(
+    user_id: UUID,
+    hotwheels_id: UUID,
+    db: AsyncSession = Depends(get_async_session),
 ):
-    user_hotwheels_item = (
-        db.query(UserHotwheels)
-        .filter(
-            UserHotwheels.user_id == user_id, UserHotwheels.hotwheels_id == hotwheels_id
+    """One listing (e.g. the seller row opened from /hotwheels/{id}/sellers); counts a listing view."""
+    user_hotwheels_item = await db.get(UserHotwheels, (user_id, hotwheels_id))
+    if not user_hotwheels_item:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="UserHotwheels item not found"
         )
-        .first()
-    )
+
+    visit_counter.user_hotwheels_viewed(user_id, hotwheels_id)
+    return user_hotwheels_item
+
+
+@router.delete("/{user_id}/{hotwheels_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_user_hotwheels_item(
+    user_id: UUID, hotwheels_id: UUID, db: AsyncSession = Depends(get_async_session)
+):
+    user_hotwheels_item = await db.get(UserHotwheels, (user_id, hotwheels_id))
     if not user_hotwheels_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="UserHotwheels item not found"
         )
 
-    db.delete(user_hotwheels_item)
-    db.commit()
+    await db.delete(user_hotwheels_item)
+    await refresh_market(db, hotwheels_id)
+    await db.commit()
+    invalidate_cached_totals(user_id, hotwheels_id)
+    invalidate_membership(user_id)
     return None
 
 
@@ -152,17 +244,10 @@ async def update_user_hotwheels(
     user_id: UUID,
     hotwheels_id: UUID,
     update_data: UserHotwheelsUpdate,
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
     # Check if the item exists
-    user_hotwheels_item = (
-        db.query(UserHotwheels)
-        .filter(
-            UserHotwheels.user_id == user_id, 
-            UserHotwheels.hotwheels_id == hotwheels_id
-        )
-        .first()
-    )
+    user_hotwheels_item = await db.get(UserHotwheels, (user_id, hotwheels_id))
     
     if not user_hotwheels_item:
         raise HTTPException(
@@ -181,12 +266,15 @@ async def update_user_hotwheels(
         for key, value in update_values.items():
             setattr(user_hotwheels_item, key, value)
             
-        db.commit()
-        db.refresh(user_hotwheels_item)
+        await refresh_market(db, hotwheels_id)
+        await db.commit()
+        await db.refresh(user_hotwheels_item)
+        invalidate_cached_totals(user_id, hotwheels_id)
+        invalidate_membership(user_id)
         return user_hotwheels_item
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred while updating the record: {str(e)}"
@@ -198,47 +286,33 @@ async def get_user_hotwheels_cards(
     user_id: UUID,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_session),
+    cursor: str | None = None,
+    total_mode: TotalMode = TotalMode.EXACT,
+    db: AsyncSession = Depends(get_async_session),
 ):
     """
     Get all hotwheels card information for a specific user.
     Returns combined data from UserHotwheels and Hotwheels tables.
+    Pass the returned next_cursor as cursor to fetch the next page by key.
     """
     query = (
-        db.query(UserHotwheels, Hotwheels)
+        select(*CARD_COLUMNS)
         .join(Hotwheels, UserHotwheels.hotwheels_id == Hotwheels.id)
-        .filter(UserHotwheels.user_id == user_id)
+        .where(UserHotwheels.user_id == user_id)
     )
     
-    total = query.count()
-    results = query.offset(skip).limit(limit).all()
-    
-    # Combine the data from both tables
-    items = []
-    for user_hw, hw in results:
-        card_info = {
-            # Hotwheels info
-            "id": hw.id,
-            "model_name": hw.model_name,
-            "image_url": hw.image_url,
-            "collector_number": hw.collector_number,
-            "series": hw.series,
-            "color": hw.color,
-            "release_year": hw.release_year,
-            
-            # UserHotwheels info
-            "modality": user_hw.modality,
-            "favorite": user_hw.favorite,
-            "price": user_hw.price,
-            "description": user_hw.description,
-            "sold": user_hw.sold,
-            "quantity": user_hw.quantity,
-            "is_negotiable": user_hw.is_negotiable,
-            "visit_count": user_hw.visit_count,
-        }
-        items.append(card_info)
-    
-    return {"total": total, "items": items}
+    results, total, total_mode, next_cursor = await fetch_page(
+        db,
+        query,
+        [(UserHotwheels.hotwheels_id, False, UUID)],
+        lambda row: [row.id],
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        scope=f"user-hotwheels-cards:{user_id}",
+        total_mode=total_mode,
+    )
+    return list_response(rows_as_dicts(results, CARD_FIELDS), total, next_cursor, total_mode)
 
 
 @router.get("/hotwheels/{hotwheels_id}/sellers", response_model=HotwheelsSellersResponse)
@@ -246,14 +320,17 @@ async def get_hotwheels_sellers(
     hotwheels_id: UUID,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_session),
+    cursor: str | None = None,
+    total_mode: TotalMode = TotalMode.EXACT,
+    db: AsyncSession = Depends(get_async_session),
 ):
     """
     Get all sellers for a specific Hotwheels model.
     Returns seller information with pricing details.
+    Pass the returned next_cursor as cursor to fetch the next page by key.
     """
     # Check if the hotwheels exists
-    hotwheels = db.query(Hotwheels).filter(Hotwheels.id == hotwheels_id).first()
+    hotwheels = await catalog_cache.get(db, hotwheels_id)
     if not hotwheels:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -262,46 +339,205 @@ async def get_hotwheels_sellers(
     
     # Query users who have this hotwheels with modality=SALE
     query = (
-        db.query(
-            UserHotwheels.user_id,
-            UserHotwheels.price,
-            UserHotwheels.is_negotiable,
-            UserHotwheels.description,
-            UserHotwheels.quantity,
-            UserHotwheels.sold,
-            User.nickname,
-            User.avatar_url,
-            User.state,
-            User.city,
-            User.cep,
-        )
+        select(*SELLER_COLUMNS)
         .join(User, UserHotwheels.user_id == User.id)
-        .filter(
+        .where(
             UserHotwheels.hotwheels_id == hotwheels_id,
             UserHotwheels.modality == UserHotwheelsModality.SALE,
             User.is_active == True
         )
     )
     
-    total = query.count()
-    results = query.offset(skip).limit(limit).all()
-    
-    # Format the results
-    items = []
-    for result in results:
-        seller_info = {
-            "user_id": result.user_id,
-            "nickname": result.nickname,
-            "avatar_url": result.avatar_url,
-            "price": result.price,
-            "is_negotiable": result.is_negotiable,
-            "description": result.description,
-            "state": result.state,
-            "city": result.city,
-            "cep": result.cep,
-            "quantity": result.quantity,
-            "sold": result.sold,
-        }
-        items.append(seller_info)
+    results, total, total_mode, next_cursor = await fetch_page(
+        db,
+        query,
+        [(UserHotwheels.user_id, False, UUID)],
+        lambda row: [row.user_id],
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        scope=f"hotwheels-sellers:{hotwheels_id}",
+        total_mode=total_mode,
+    )
     
-    return {"total": total, "items": items}
+    return list_response(rows_as_dicts(results, SELLER_FIELDS), total, next_cursor, total_mode)
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _bulk_values(items) -> dict:
+    """Set fields per hotwheels_id, first occurrence only (later ones are reported as duplicates)."""
+    bulk = {}
+    for item in items:
+        if item.hotwheels_id not in bulk:
+            bulk[item.hotwheels_id] = {
+                k: v for k, v in item.model_dump(exclude={"hotwheels_id"}).items() if v is not None
+            }
+    return bulk
+
+
+def _by_fields(bulk: dict):
+    """Groups the cars by the set of fields they set, so each group fits one statement shape."""
+    groups = {}
+    for hotwheels_id, fields in bulk.items():
+        groups.setdefault(tuple(sorted(fields)), []).append((hotwheels_id, fields))
+    return groups.items()
+
+
+def _bulk_response(requested: list, statuses: dict) -> dict:
+    results = []
+    seen = set()
+    for hotwheels_id in requested:
+        outcome = BulkStatus.DUPLICATE if hotwheels_id in seen else statuses[hotwheels_id]
+        seen.add(hotwheels_id)
+        results.append({"hotwheels_id": hotwheels_id, "status": outcome})
+    return {"results": results, "counts": Counter(result["status"] for result in results)}
+
+
+async def _commit_bulk(db: AsyncSession, user_id: UUID, changed: list):
+    """Refreshes the market of the changed models, commits, and drops the stale cached totals."""
+    try:
+        await refresh_market(db, *changed)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid user_id or hotwheels_id",
+        )
+    for hotwheels_id in changed:
+        invalidate_cached_totals(user_id, hotwheels_id)
+    invalidate_membership(user_id)
+
+
+@router.post("/user/{user_id}/bulk", response_model=UserHotwheelsBulkResponse)
+async def bulk_create_user_hotwheels(
+    user_id: UUID,
+    bulk: UserHotwheelsBulkCreate,
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Add many Hot Wheels to a user at once (e.g. importing a collection).
+    Runs one INSERT ... ON CONFLICT per USER_HOTWHEELS_BULK_CHUNK cars that
+    set the same fields. Cars the user already has are skipped, or get the
+    given fields overwritten with on_conflict=update. Every requested car
+    gets a status: created, updated, skipped, not_found or duplicate.
+    """
+    if not await db.get(User, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+
+    requested = [item.hotwheels_id for item in bulk.items]
+    items = _bulk_values(bulk.items)
+    found = await catalog_cache.get_many(db, list(items))
+    statuses = {hotwheels_id: BulkStatus.NOT_FOUND for hotwheels_id in items if hotwheels_id not in found}
+
+    for fields, group in _by_fields({k: v for k, v in items.items() if k in found}):
+        for chunk in _chunks(group, config.USER_HOTWHEELS_BULK_CHUNK):
+            statement = insert(UserHotwheels).values([
+                {**BULK_DEFAULTS, **item_fields, "user_id": user_id, "hotwheels_id": hotwheels_id}
+                for hotwheels_id, item_fields in chunk
+            ])
+            keys = [UserHotwheels.user_id, UserHotwheels.hotwheels_id]
+            if bulk.on_conflict == BulkConflict.UPDATE and fields:
+                statement = statement.on_conflict_do_update(
+                    index_elements=keys,
+                    set_={**{field: statement.excluded[field] for field in fields}, "update_at": func.now()},
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=keys)
+            # xmax is 0 only for rows this statement inserted
+            rows = await db.execute(statement.returning(
+                UserHotwheels.hotwheels_id, literal_column("xmax = 0").label("inserted")
+            ))
+            for hotwheels_id, inserted in rows:
+                statuses[hotwheels_id] = BulkStatus.CREATED if inserted else BulkStatus.UPDATED
+
+    # DO NOTHING returns no row for the cars that were already there
+    for hotwheels_id in items:
+        statuses.setdefault(hotwheels_id, BulkStatus.SKIPPED)
+    changed = [k for k, v in statuses.items() if v in (BulkStatus.CREATED, BulkStatus.UPDATED)]
+    await _commit_bulk(db, user_id, changed)
+    return _bulk_response(requested, statuses)
+
+
+@router.patch("/user/{user_id}/bulk", response_model=UserHotwheelsBulkResponse)
+async def bulk_update_user_hotwheels(
+    user_id: UUID,
+    bulk: UserHotwheelsBulkUpdate,
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Update many of a user's Hot Wheels at once (e.g. repricing the stock).
+    Each car may set its own values; cars that set the same fields share
+    one UPDATE ... FROM (VALUES ...) per USER_HOTWHEELS_BULK_CHUNK cars.
+    Every requested car gets a status: updated, skipped (nothing to set),
+    not_found or duplicate.
+    """
+    requested = [item.hotwheels_id for item in bulk.items]
+    items = _bulk_values(bulk.items)
+    table = UserHotwheels.__table__
+    statuses = {}
+
+    for fields, group in _by_fields(items):
+        if not fields:
+            continue
+        for chunk in _chunks(group, config.USER_HOTWHEELS_BULK_CHUNK):
+            v = values(
+                column("hotwheels_id", table.c.hotwheels_id.type),
+                *[column(field, table.c[field].type) for field in fields],
+                name="v",
+            ).data([(hotwheels_id, *[item_fields[field] for field in fields]) for hotwheels_id, item_fields in chunk])
+            updated = await db.scalars(
+                update(table)
+                .values({field: v.c[field] for field in fields})
+                .where(table.c.user_id == user_id, table.c.hotwheels_id == v.c.hotwheels_id)
+                .returning(table.c.hotwheels_id)
+            )
+            statuses.update({hotwheels_id: BulkStatus.UPDATED for hotwheels_id in updated})
+
+    pending = [hotwheels_id for hotwheels_id in items if hotwheels_id not in statuses]
+    if pending:
+        existing = set((await db.scalars(select(UserHotwheels.hotwheels_id).where(
+            UserHotwheels.user_id == user_id,
+            UserHotwheels.hotwheels_id == any_(bindparam("bulk_ids", pending, type_=ARRAY(table.c.hotwheels_id.type))),
+        ))).all())
+        for hotwheels_id in pending:
+            statuses[hotwheels_id] = BulkStatus.SKIPPED if hotwheels_id in existing else BulkStatus.NOT_FOUND
+
+    await _commit_bulk(db, user_id, [k for k, v in statuses.items() if v == BulkStatus.UPDATED])
+    return _bulk_response(requested, statuses)
+
+
+@router.post("/user/{user_id}/bulk/delete", response_model=UserHotwheelsBulkResponse)
+async def bulk_delete_user_hotwheels(
+    user_id: UUID,
+    bulk: UserHotwheelsBulkDelete,
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Remove many Hot Wheels from a user at once, with one DELETE per
+    USER_HOTWHEELS_BULK_CHUNK IDs. Every requested car gets a status:
+    deleted, not_found or duplicate.
+    """
+    table = UserHotwheels.__table__
+    ids = list(dict.fromkeys(bulk.hotwheels_ids))
+    deleted = set()
+    for chunk in _chunks(ids, config.USER_HOTWHEELS_BULK_CHUNK):
+        deleted.update(await db.scalars(
+            delete(table)
+            .where(
+                table.c.user_id == user_id,
+                table.c.hotwheels_id == any_(bindparam("bulk_ids", chunk, type_=ARRAY(table.c.hotwheels_id.type))),
+            )
+            .returning(table.c.hotwheels_id)
+        ))
+
+    statuses = {hotwheels_id: BulkStatus.DELETED if hotwheels_id in deleted else BulkStatus.NOT_FOUND for hotwheels_id in ids}
+    await _commit_bulk(db, user_id, list(deleted))
+    return _bulk_response(bulk.hotwheels_ids, statuses)
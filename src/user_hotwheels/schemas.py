@@ -1,8 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import Dict, List
 from uuid import UUID
 from datetime import datetime
 from src.user_hotwheels.models import UserHotwheelsModality
 from decimal import Decimal
+from src.pagination import ListResponse
+from src.config import USER_HOTWHEELS_BULK_MAX
+import enum
 
 class UserHotwheelsCreate(BaseModel):
     user_id: UUID
@@ -25,9 +29,8 @@ class UserHotwheelsResponse(BaseModel):
     class Config:
         from_attributes = True
 
-class UserHotwheelsListResponse(BaseModel):
-    total: int
-    items: list[UserHotwheelsResponse]
+class UserHotwheelsListResponse(ListResponse[UserHotwheelsResponse]):
+    pass
 
 class UserHotwheelsUpdate(BaseModel):
     modality: UserHotwheelsModality | None = None
@@ -62,9 +65,8 @@ class HotwheelsCardInfo(BaseModel):
     class Config:
         from_attributes = True
 
-class UserHotwheelsCardListResponse(BaseModel):
-    total: int
-    items: list[HotwheelsCardInfo]
+class UserHotwheelsCardListResponse(ListResponse[HotwheelsCardInfo]):
+    pass
 
 class HotwheelsSeller(BaseModel):
     user_id: UUID
@@ -82,6 +84,40 @@ class HotwheelsSeller(BaseModel):
     class Config:
         from_attributes = True
 
-class HotwheelsSellersResponse(BaseModel):
-    total: int
-    items: list[HotwheelsSeller]
\ No newline at end of file
+class HotwheelsSellersResponse(ListResponse[HotwheelsSeller]):
+    pass
+
+class BulkConflict(str, enum.Enum):
+    SKIP = "skip"
+    UPDATE = "update"
+
+class BulkStatus(str, enum.Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    SKIPPED = "skipped"
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
+    DUPLICATE = "duplicate"
+
+class UserHotwheelsBulkItem(UserHotwheelsUpdate):
+    """One car of a bulk request; fields left out (None) keep their default or current value"""
+    hotwheels_id: UUID
+
+class UserHotwheelsBulkCreate(BaseModel):
+    items: List[UserHotwheelsBulkItem] = Field(..., min_length=1, max_length=USER_HOTWHEELS_BULK_MAX)
+    on_conflict: BulkConflict = Field(BulkConflict.SKIP, description="What to do with cars the user already has: keep them as they are, or overwrite the given fields")
+
+class UserHotwheelsBulkUpdate(BaseModel):
+    items: List[UserHotwheelsBulkItem] = Field(..., min_length=1, max_length=USER_HOTWHEELS_BULK_MAX)
+
+class UserHotwheelsBulkDelete(BaseModel):
+    hotwheels_ids: List[UUID] = Field(..., min_length=1, max_length=USER_HOTWHEELS_BULK_MAX)
+
+class UserHotwheelsBulkResult(BaseModel):
+    hotwheels_id: UUID
+    status: BulkStatus
+
+class UserHotwheelsBulkResponse(BaseModel):
+    """Outcome of every requested car, in request order, plus a count per status"""
+    results: List[UserHotwheelsBulkResult]
+    counts: Dict[BulkStatus, int]
@@ -1,45 +1,68 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy import select
-from src.database import get_session
-from src.auth.models import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database import get_async_session
+from src.auth.models import User, UserRole
 from src.auth.router import get_current_user
-from .schemas import UserResponse, UserUpdate
+from src.auth.dependencies import user_status_cache
+from src.visits import visit_counter
+from src.http_cache import PRIVATE_POLICY, conditional, make_etag
+from src.user_hotwheels.market import refresh_user_market
+from src.membership import lookup_membership
+from .schemas import UserResponse, UserUpdate, MembershipRequest, MembershipResponse
 from uuid import UUID
 
 router = APIRouter()
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_current_user(user_id: UUID, db: Session = Depends(get_session)):
-    user = db.query(User).filter(User.id == user_id).first()
+async def get_user(
+    user_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_session),
+):
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    # O único lugar que conta visita ao perfil; as listas do perfil não contam
+    visit_counter.user_viewed(user_id)
+    # visit_count e last_seen mudam sem tocar em updated_at, por isso entram no ETag
+    not_modified = conditional(
+        request,
+        response,
+        etag=make_etag(user.id, user.updated_at, user.visit_count, user.last_seen),
+        last_modified=user.updated_at,
+        cache_control=PRIVATE_POLICY,
+    )
+    return not_modified or user
 
 
 @router.patch("/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: UUID,
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    if current_user.id != user_id and current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Not allowed to update this user")
+
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     if user_update.email and user_update.email != user.email:
-        existing_email = db.execute(
+        existing_email = (await db.execute(
             select(User).where(User.email == user_update.email)
-        ).first()
+        )).first()
         if existing_email:
             raise HTTPException(status_code=409, detail="Email already registered")
 
     if user_update.nickname and user_update.nickname != user.nickname:
-        existing_nickname = db.execute(
+        existing_nickname = (await db.execute(
             select(User).where(User.nickname == user_update.nickname)
-        ).first()
+        )).first()
         if existing_nickname:
             raise HTTPException(status_code=409, detail="Nickname already taken")
 
@@ -47,7 +70,35 @@ def update_user(
     for field, value in update_data.items():
         setattr(user, field, value)
 
-    db.commit()
-    db.refresh(user)
+    if "is_active" in update_data:
+        # Vendedores inativos não entram no índice de preços
+        await refresh_user_market(db, user.id)
+    await db.commit()
+    await db.refresh(user)
+    # Desativação vale na hora neste worker; nos outros, ao fim do AUTH_USER_STATUS_TTL
+    user_status_cache.invalidate(user.id)
     return user
 
+
+@router.post("/{user_id}/membership", response_model=MembershipResponse)
+async def get_user_membership(
+    user_id: UUID,
+    membership: MembershipRequest,
+    db: AsyncSession = Depends(get_async_session),
+):
+    """
+    Owned / for sale / wishlisted flags of many models at once, replacing
+    one /user_hotwheels/check and one /wishlist/check call per card.
+    Items follow the request order, with duplicates collapsed.
+    """
+    hotwheels_ids = list(dict.fromkeys(membership.hotwheels_ids))
+    sets = await lookup_membership(db, user_id, hotwheels_ids)
+    return {"items": [
+        {
+            "hotwheels_id": hotwheels_id,
+            "owned": hotwheels_id in sets.owned,
+            "for_sale": hotwheels_id in sets.for_sale,
+            "wishlisted": hotwheels_id in sets.wishlisted,
+        }
+        for hotwheels_id in hotwheels_ids
+    ]}
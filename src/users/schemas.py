@@ -1,8 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import datetime
 from src.auth.models import UserRole
-from typing import Dict
+from src.config import HOTWHEELS_BATCH_MAX
+from typing import Dict, List
 from typing import Optional
 
 class UserResponse(BaseModel):
@@ -35,4 +36,16 @@ class UserUpdate(BaseModel):
     is_active: bool | None = None
     visit_count: int | None = None
     last_seen: datetime | None = None
-    role: UserRole | None
\ No newline at end of file
+    role: UserRole | None
+
+class MembershipRequest(BaseModel):
+    hotwheels_ids: List[UUID] = Field(..., min_length=1, max_length=HOTWHEELS_BATCH_MAX)
+
+class HotwheelsMembership(BaseModel):
+    hotwheels_id: UUID
+    owned: bool
+    for_sale: bool
+    wishlisted: bool
+
+class MembershipResponse(BaseModel):
+    items: List[HotwheelsMembership]
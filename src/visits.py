@@ -0,0 +1,149 @@
+from collections import defaultdict
+from sqlalchemy import Integer, column, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from src.auth.models import User
+from src.hotwheels.models import Hotwheels
+from src.user_hotwheels.models import UserHotwheels
+from src import config
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ShardedCounter:
+    """In-memory counters split across shards, each with its own lock."""
+
+    def __init__(self, shards: int):
+        self._shards = [(threading.Lock(), defaultdict(int)) for _ in range(shards)]
+
+    def add(self, key, amount: int = 1):
+        lock, counts = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            counts[key] += amount
+
+    def drain(self) -> dict:
+        """Takes the accumulated counts, leaving every shard empty."""
+        drained = defaultdict(int)
+        for lock, counts in self._shards:
+            with lock:
+                taken = dict(counts)
+                counts.clear()
+            for key, amount in taken.items():
+                drained[key] += amount
+        return drained
+
+    def pending(self) -> int:
+        return sum(len(counts) for _, counts in self._shards)
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class VisitCounter:
+    """
+    Write-behind view counting for hotwheels, users and user_hotwheels.
+
+    Views are only counted in memory (per worker process); a background
+    task periodically flushes the aggregated increments with one
+    `UPDATE ... FROM (VALUES ...)` per table and batch. The timestamp
+    columns are written back unchanged, so a flush does not invalidate the
+    catalog cache or the ETags built on them. Pending counts are flushed on
+    shutdown, and put back for the next attempt if a flush fails.
+    """
+
+    def __init__(self, shards: int, flush_interval: float, batch_size: int):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.hotwheels = ShardedCounter(shards)
+        self.users = ShardedCounter(shards)
+        self.user_hotwheels = ShardedCounter(shards)
+        self.flushed = 0
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+    def hotwheels_viewed(self, hotwheels_id):
+        self.hotwheels.add(hotwheels_id)
+
+    def user_viewed(self, user_id):
+        self.users.add(user_id)
+
+    def user_hotwheels_viewed(self, user_id, hotwheels_id):
+        self.user_hotwheels.add((user_id, hotwheels_id))
+
+    def _statements(self, hotwheels: dict, users: dict, user_hotwheels: dict):
+        uuid_type = UUID(as_uuid=True)
+        for batch in _chunks(list(hotwheels.items()), self.batch_size):
+            v = values(column("id", uuid_type), column("n", Integer), name="v").data(batch)
+            yield update(Hotwheels.__table__).values(
+                visit_count=Hotwheels.visit_count + v.c.n, update_at=Hotwheels.update_at
+            ).where(Hotwheels.id == v.c.id)
+        for batch in _chunks(list(users.items()), self.batch_size):
+            v = values(column("id", uuid_type), column("n", Integer), name="v").data(batch)
+            yield update(User.__table__).values(
+                visit_count=User.visit_count + v.c.n, updated_at=User.updated_at
+            ).where(User.id == v.c.id)
+        rows = [(user_id, hotwheels_id, n) for (user_id, hotwheels_id), n in user_hotwheels.items()]
+        for batch in _chunks(rows, self.batch_size):
+            v = values(
+                column("user_id", uuid_type), column("hotwheels_id", uuid_type), column("n", Integer), name="v"
+            ).data(batch)
+            yield update(UserHotwheels.__table__).values(
+                visit_count=UserHotwheels.visit_count + v.c.n, update_at=UserHotwheels.update_at
+            ).where(UserHotwheels.user_id == v.c.user_id, UserHotwheels.hotwheels_id == v.c.hotwheels_id)
+
+    async def flush(self, session_maker):
+        hotwheels = self.hotwheels.drain()
+        users = self.users.drain()
+        user_hotwheels = self.user_hotwheels.drain()
+        if not (hotwheels or users or user_hotwheels):
+            return
+        try:
+            async with session_maker() as session:
+                for statement in self._statements(hotwheels, users, user_hotwheels):
+                    await session.execute(statement)
+                await session.commit()
+        except Exception:
+            logger.exception("Visit counter flush failed; keeping counts for the next attempt")
+            for counter, counts in ((self.hotwheels, hotwheels), (self.users, users), (self.user_hotwheels, user_hotwheels)):
+                for key, amount in counts.items():
+                    counter.add(key, amount)
+            return
+        self.flushed += sum(hotwheels.values()) + sum(users.values()) + sum(user_hotwheels.values())
+
+    async def _run(self, session_maker):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush(session_maker)
+
+    def start(self, session_maker):
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run(session_maker))
+
+    async def stop(self, session_maker):
+        """Stops the background task after a last flush of the pending counts."""
+        if self._task is None:
+            await self.flush(session_maker)
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "pending_keys": {
+                "hotwheels": self.hotwheels.pending(),
+                "users": self.users.pending(),
+                "user_hotwheels": self.user_hotwheels.pending(),
+            },
+            "flushed_views": self.flushed,
+        }
+
+
+visit_counter = VisitCounter(config.VISIT_COUNTER_SHARDS, config.VISIT_FLUSH_INTERVAL, config.VISIT_FLUSH_BATCH)
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import declarative_base, relationship
-from sqlalchemy import Column, UUID, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, UUID, TIMESTAMP, ForeignKey, Index
 from sqlalchemy.sql import func
 from uuid import uuid4
 from src.base import Base
@@ -15,4 +15,9 @@ class Wishlist(Base):
     update_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
     
     user = relationship("User", back_populates="wishlists")
-    hotwheels = relationship("Hotwheels", back_populates="wishlists")
\ No newline at end of file
+    hotwheels = relationship("Hotwheels", back_populates="wishlists")
+
+    __table_args__ = (
+        # A PK (user_id, hotwheels_id) não serve para buscas por modelo
+        Index('idx_wishlist_hotwheels_user', hotwheels_id, user_id),
+    )
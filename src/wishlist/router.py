@@ -1,70 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from src.database import get_session
+from src.database import get_async_session
 from src.wishlist.models import Wishlist
 from src.wishlist.schemas import WishlistCreate, WishlistResponse
 from src.hotwheels.schemas import HotwheelsSearchResponse
-from src.hotwheels.models import Hotwheels
+from src.hotwheels.cache import catalog_cache
+from src.http_cache import PRIVATE_POLICY, conditional, make_etag
+from src.membership import invalidate_membership
 from uuid import UUID
 
 router = APIRouter()
 
 
 @router.post("/", response_model=WishlistResponse)
-def create_wishlist_item(wishlist: WishlistCreate, db: Session = Depends(get_session)):
+async def create_wishlist_item(wishlist: WishlistCreate, db: AsyncSession = Depends(get_async_session)):
     db_wishlist = Wishlist(
         user_id=wishlist.user_id,
         hotwheels_id=wishlist.hotwheels_id
     )
     db.add(db_wishlist)
     try:
-        db.commit()
-        db.refresh(db_wishlist)
+        await db.commit()
+        await db.refresh(db_wishlist)
+        invalidate_membership(db_wishlist.user_id)
         return db_wishlist
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Item already exists in wishlist or invalid IDs"
         )
 
 @router.delete("/{user_id}/{hotwheels_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_wishlist_item(user_id: UUID, hotwheels_id: UUID, db: Session = Depends(get_session)):
-    wishlist_item = db.query(Wishlist).filter(Wishlist.user_id == user_id, Wishlist.hotwheels_id == hotwheels_id).first()
+async def delete_wishlist_item(user_id: UUID, hotwheels_id: UUID, db: AsyncSession = Depends(get_async_session)):
+    wishlist_item = await db.get(Wishlist, (user_id, hotwheels_id))
     if not wishlist_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Wishlist item not found"
         )
     
-    db.delete(wishlist_item)
-    db.commit()
+    await db.delete(wishlist_item)
+    await db.commit()
+    invalidate_membership(user_id)
     return None
 
 @router.get("/check")
-def check_wishlist_item(user_id: UUID, hotwheels_id: UUID, db: Session = Depends(get_session)):
-    wishlist_item = db.query(Wishlist).filter(
-        Wishlist.user_id == user_id,
-        Wishlist.hotwheels_id == hotwheels_id
-    ).first()
+async def check_wishlist_item(user_id: UUID, hotwheels_id: UUID, db: AsyncSession = Depends(get_async_session)):
+    wishlist_item = await db.get(Wishlist, (user_id, hotwheels_id))
     
     return {"exists": wishlist_item is not None}
 
 @router.get("/user/{user_id}", response_model=List[HotwheelsSearchResponse])
-def get_user_wishlist(user_id: UUID, db: Session = Depends(get_session)):
-    wishlist_items = db.query(
-        Hotwheels.id,
-        Hotwheels.model_name,
-        Hotwheels.image_url,
-        Hotwheels.series,
-        Hotwheels.color,
-        Hotwheels.release_year
-    ).join(
-        Wishlist, Wishlist.hotwheels_id == Hotwheels.id
-    ).filter(
-        Wishlist.user_id == user_id
-    ).all()
-    
-    return wishlist_items
+async def get_user_wishlist(
+    user_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_session),
+):
+    hotwheels_ids = (await db.scalars(
+        select(Wishlist.hotwheels_id).where(Wishlist.user_id == user_id)
+    )).all()
+    catalog = await catalog_cache.get_many(db, hotwheels_ids)
+    items = [catalog[hotwheels_id] for hotwheels_id in hotwheels_ids if hotwheels_id in catalog]
 
+    # The list changes on add/remove and when a listed model is updated;
+    # removals leave no timestamp behind, so only the ETag is used.
+    not_modified = conditional(
+        request,
+        response,
+        etag=make_etag(*(f"{item.id}@{item.update_at}" for item in items)),
+        cache_control=PRIVATE_POLICY,
+    )
+    return not_modified or items